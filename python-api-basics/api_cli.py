@@ -0,0 +1,216 @@
+"""
+Batch API CLI
+=============
+Non-interactive lookups for scripts and cron: read inputs from arguments,
+files or stdin, run them concurrently and write one result per line.
+
+Learn:
+- argparse subcommands
+- A bounded work queue: at most --concurrency lookups in flight, so
+  memory stays flat however long the input is
+- Streaming output (NDJSON or CSV) as each result completes
+
+Usage:
+    python api_cli.py weather --cities delhi,london
+    python api_cli.py crypto --coins-file coins.txt --bulk --format csv
+    cat urls.txt | python api_cli.py fetch --concurrency 16 > results.ndjson
+
+Results come out in completion order, each with its input (city, coin or
+url) so they can be matched up. The exit status is 1 if any lookup failed.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import partial
+
+import codec
+import part5_real_api
+from part4_error_handling import safe_api_request
+
+DEFAULT_CONCURRENCY = part5_real_api.MAX_WORKERS
+
+# CSV columns per subcommand (NDJSON lines carry the same keys)
+FIELDS = {
+    "weather": ["city", "ok", "temperature", "windspeed", "winddirection", "weathercode",
+                "time", "latitude", "longitude", "error"],
+    "crypto": ["coin", "ok", "id", "name", "symbol", "rank", "price", "percent_change_24h",
+               "market_cap", "error"],
+    "fetch": ["url", "ok", "data", "error"],
+}
+
+
+# -------------------------------
+# Input
+# -------------------------------
+def read_inputs(inline=None, lines=None):
+    """Yield inputs from a comma-separated argument, an open file, or stdin.
+
+    Files are read lazily, one line at a time; blank lines and # comments are skipped.
+    """
+    if inline:
+        yield from (item.strip() for item in inline.split(",") if item.strip())
+        return
+
+    if lines is None:
+        lines = sys.stdin
+
+    with lines:
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+# -------------------------------
+# Lookups (never raise: failures become records with ok=False)
+# -------------------------------
+def lookup_weather(city, use_cache=True):
+    if city.lower().strip() not in part5_real_api.CITIES:
+        return {"city": city, "ok": False, "error": "unknown city"}
+    weather = part5_real_api.get_weather(city, use_cache=use_cache)
+    if weather is None:
+        return {"city": city, "ok": False, "error": "request failed"}
+    return {"city": city, "ok": True, **weather.to_dict()}
+
+
+def lookup_crypto(coin, use_cache=True, bulk=False):
+    ticker = part5_real_api.get_crypto_price(coin, use_cache=use_cache, bulk=bulk)
+    if ticker is None:
+        return {"coin": coin, "ok": False, "error": "not found or request failed"}
+    return {"coin": coin, "ok": True, **ticker.to_dict()}
+
+
+def lookup_url(url, timeout=10, retries=3):
+    result = safe_api_request(url, timeout=timeout, retries=retries)
+    if result["success"]:
+        return {"url": url, "ok": True, "data": result["data"]}
+    return {"url": url, "ok": False, "error": result["error"]}
+
+
+def run_bounded(items, fn, concurrency):
+    """Yield fn(item) for every item as each finishes, with at most `concurrency` running.
+
+    Items are pulled from the iterator only when a slot is free.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for item in items:
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(fn, item))
+
+        for future in as_completed(pending):
+            yield future.result()
+
+
+# -------------------------------
+# Output
+# -------------------------------
+class NDJSONWriter:
+    def __init__(self, stream, fields):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(codec.dumps(record, indent=False).decode("utf-8") + "\n")
+        self.stream.flush()
+
+
+class CSVWriter:
+    def __init__(self, stream, fields):
+        self.stream = stream
+        self._writer = csv.DictWriter(stream, fieldnames=fields, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, record):
+        if isinstance(record.get("data"), (dict, list)):
+            record = {**record, "data": codec.dumps(record["data"], indent=False).decode("utf-8")}
+        self._writer.writerow(record)
+        self.stream.flush()
+
+
+WRITERS = {"ndjson": NDJSONWriter, "csv": CSVWriter}
+
+
+# -------------------------------
+# Command line
+# -------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(description="Batch weather, crypto and URL lookups")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"lookups in flight at once (default {DEFAULT_CONCURRENCY})")
+    common.add_argument("--format", choices=sorted(WRITERS), default="ndjson")
+    common.add_argument("--no-cache", action="store_true", help="skip the in-memory response cache")
+    common.add_argument("--verbose", action="store_true", help="log every request to stderr")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Files are opened while parsing, so a bad path is a usage error before any output
+    input_file = argparse.FileType("r", encoding="utf-8")
+
+    weather = commands.add_parser("weather", parents=[common], help="current weather per city")
+    cities = weather.add_mutually_exclusive_group()
+    cities.add_argument("--cities", help="comma-separated city names")
+    cities.add_argument("--cities-file", type=input_file,
+                        help="file with one city per line ('-' for stdin)")
+
+    crypto = commands.add_parser("crypto", parents=[common], help="ticker per coin")
+    coins = crypto.add_mutually_exclusive_group()
+    coins.add_argument("--coins", help="comma-separated coin names or ids")
+    coins.add_argument("--coins-file", type=input_file,
+                       help="file with one coin per line ('-' for stdin)")
+    crypto.add_argument("--bulk", action="store_true",
+                        help="look every coin up in one /v1/tickers download")
+
+    fetch = commands.add_parser("fetch", parents=[common], help="GET JSON from each URL")
+    fetch.add_argument("--urls-file", type=input_file, help="file with one URL per line (default stdin)")
+    fetch.add_argument("--timeout", type=float, default=10)
+    fetch.add_argument("--retries", type=int, default=3)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.ERROR)
+
+    use_cache = not args.no_cache
+    if args.command == "weather":
+        items = read_inputs(args.cities, args.cities_file)
+        fn = partial(lookup_weather, use_cache=use_cache)
+    elif args.command == "crypto":
+        items = read_inputs(args.coins, args.coins_file)
+        fn = partial(lookup_crypto, use_cache=use_cache, bulk=args.bulk)
+    else:
+        items = read_inputs(lines=args.urls_file)
+        fn = partial(lookup_url, timeout=args.timeout, retries=args.retries)
+
+    # Records go to stdout; anything the helpers print goes to stderr
+    out = sys.stdout
+    sys.stdout = sys.stderr
+    writer = WRITERS[args.format](out, FIELDS[args.command])
+
+    failed = 0
+    try:
+        for record in run_bounded(items, fn, max(1, args.concurrency)):
+            writer.write(record)
+            failed += not record["ok"]
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head): stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 1
+    finally:
+        sys.stdout = out
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,469 @@
+"""
+Shared HTTP Client
+==================
+Every part goes through this module instead of calling requests.get/post directly.
+
+Learn:
+- Re-using connections with a requests.Session
+- Connection pools per host (DNS + TCP + TLS setup is paid once)
+- Default timeouts and headers in one place
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING as _DECODABLE
+
+import codec
+from cache import make_key
+from circuit_breaker import get_breaker
+from rate_limit import get_limiter
+from disk_cache import DiskCache, DEFAULT_PATH, DEFAULT_MAX_BYTES
+from http2 import HTTP2Adapter, HTTP2_AVAILABLE
+from metrics import metrics
+
+# -------------------------------
+# Client settings
+# -------------------------------
+POOL_SIZE = 10        # Connections kept open per host
+DEFAULT_TIMEOUT = 10  # Seconds, used when the caller doesn't pass one
+KEEP_ALIVE = True
+
+# Preferred order; br and zstd only when their decoders are installed
+# (pip install "urllib3[brotli,zstd]")
+ACCEPT_ENCODING = ", ".join(e for e in ("br", "gzip", "zstd") if e in _DECODABLE.split(","))
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "User-Agent": "python-api-basics/1.0",
+}
+
+# Persistent GET cache (set API_DISK_CACHE=0 to turn it off)
+DISK_CACHE_ENABLED = os.environ.get("API_DISK_CACHE", "1") != "0"
+
+# Multiplex https requests over one HTTP/2 connection per host (needs httpx[http2])
+HTTP2 = os.environ.get("API_HTTP2", "0") == "1"
+if HTTP2 and not HTTP2_AVAILABLE:
+    logging.warning('API_HTTP2=1 but httpx/h2 are not installed, using HTTP/1.1 (pip install "httpx[http2]")')
+    HTTP2 = False
+
+# One pooled session per "scheme://host:port"
+_sessions = {}
+_lock = threading.Lock()
+_disk_cache = None
+
+
+def configure(pool_size=None, timeout=None, headers=None, keep_alive=None, http2=None):
+    """Change client settings. Open sessions are closed so new ones pick them up."""
+    global POOL_SIZE, DEFAULT_TIMEOUT, KEEP_ALIVE, HTTP2
+
+    if pool_size is not None:
+        POOL_SIZE = pool_size
+    if timeout is not None:
+        DEFAULT_TIMEOUT = timeout
+    if headers is not None:
+        DEFAULT_HEADERS.update(headers)
+    if keep_alive is not None:
+        KEEP_ALIVE = keep_alive
+    if http2 is not None:
+        if http2 and not HTTP2_AVAILABLE:
+            raise RuntimeError('HTTP/2 needs httpx and h2: pip install "httpx[http2]"')
+        HTTP2 = http2
+
+    close()
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+# -------------------------------
+# Connect timing
+# -------------------------------
+# Set by the connection classes below on the thread that sends the request
+_connect = threading.local()
+
+
+class _TimedConnectMixin:
+    """Records how long connect() took (DNS + TCP, plus TLS for HTTPS)."""
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _connect.seconds = time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def _record_connect(seconds):
+    _connect.seconds = seconds
+
+
+def _new_session():
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    if not KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+    adapter.poolmanager.pool_classes_by_scheme = {
+        "http": _TimedHTTPConnectionPool,
+        "https": _TimedHTTPSConnectionPool,
+    }
+    session.mount("http://", adapter)
+    if HTTP2:
+        # One multiplexed connection per host instead of a pool of sockets
+        adapter = HTTP2Adapter(pool_size=POOL_SIZE, on_connect=_record_connect)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(url):
+    """Return the pooled session for the host of url, creating it on first use."""
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _new_session()
+            _sessions[key] = session
+    return session
+
+
+def request(method, url, rate_limit=True, **kwargs):
+    """Send a request through the pooled session for its host.
+
+    Raises circuit_breaker.CircuitOpenError without sending anything while
+    the host's circuit is open. Waits for the host's rate limiter unless
+    rate_limit=False (async callers wait on it themselves).
+
+    Connection errors, timeouts and 5xx count against the breaker; any other
+    error ends the request without counting either way.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+    breaker = get_breaker(_host_key(url))
+    breaker.before_request()
+
+    limiter = get_limiter(urlsplit(url).hostname) if rate_limit else None
+    if limiter is not None:
+        try:
+            limiter.acquire()
+        except BaseException:
+            breaker.release()
+            raise
+
+    _connect.seconds = None
+    start = time.perf_counter()
+    try:
+        response = get_session(url).request(method, url, **kwargs)
+    except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+        breaker.record_failure()
+        metrics.record_error(method, url, e, time.perf_counter() - start)
+        raise
+    except requests.RequestException as e:
+        # Redirect loops, bad URLs, undecodable bodies: not a sign the host is down
+        breaker.release()
+        metrics.record_error(method, url, e, time.perf_counter() - start)
+        raise
+    except BaseException:
+        # Ctrl-C, task cancellation, bugs: never leave a half-open trial unsettled
+        breaker.release()
+        raise
+
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+    _record_response(method, url, response, time.perf_counter() - start)
+    return response
+
+
+def _wire_bytes(response, default):
+    """Body bytes read off the network so far (before decompression)."""
+    tell = getattr(response.raw, "tell", None)
+    return tell() if tell is not None else default
+
+
+def _record_response(method, url, response, seconds):
+    body = response.request.body
+    if response._content_consumed:
+        decoded = len(response.content)
+        wire = _wire_bytes(response, decoded)
+    else:
+        # Streamed body, not read yet: counted as it is read (see below)
+        wire = decoded = 0
+        _count_streamed_body(method, url, response)
+
+    metrics.record_request(
+        method,
+        url,
+        response.status_code,
+        seconds,
+        ttfb=response.elapsed.total_seconds(),
+        bytes_in=wire,
+        bytes_decoded=decoded,
+        bytes_out=len(body) if body else 0,
+        connect_time=_connect.seconds,
+    )
+
+
+def _count_streamed_body(method, url, response):
+    """Record wire vs decoded bytes of a streamed body once it is read or closed.
+
+    urllib3 decompresses chunk by chunk as iter_content() reads, so only
+    what the caller actually reads is downloaded and decoded.
+    """
+    iter_content = response.iter_content
+    close = response.close
+    decoded = 0
+    recorded = False
+
+    def record():
+        nonlocal recorded
+        if not recorded:
+            recorded = True
+            metrics.record_transfer(method, url, _wire_bytes(response, decoded), decoded)
+
+    def counting_iter_content(*args, **kwargs):
+        nonlocal decoded
+        for chunk in iter_content(*args, **kwargs):
+            decoded += len(chunk)
+            yield chunk
+        record()
+
+    def closing():
+        record()
+        close()
+
+    response.iter_content = counting_iter_content
+    response.close = closing
+
+
+def get(url, use_disk_cache=True, **kwargs):
+    """GET through the pooled session, served from or revalidated against the disk cache."""
+    cache = get_disk_cache() if use_disk_cache and not kwargs.get("stream") else None
+    if cache is None:
+        return request("GET", url, **kwargs)
+
+    key = make_key(url, kwargs.get("params"))
+    try:
+        entry = cache.lookup(key)
+    except sqlite3.Error as e:
+        # A broken or locked cache file must not fail the request
+        logging.warning(f"Disk cache lookup failed: {e}")
+        entry = None
+
+    if entry is not None:
+        if entry["expires_at"] > time.time():
+            metrics.record_cache(url, "hit")
+            return _response_from_entry(url, entry)
+
+        # Stale: ask the server whether our copy is still good
+        headers = dict(kwargs.get("headers") or {})
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        kwargs["headers"] = headers
+
+    response = request("GET", url, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        metrics.record_cache(url, "revalidated")
+        try:
+            cache.refresh(key, response.headers)
+        except sqlite3.Error as e:
+            logging.warning(f"Disk cache refresh failed: {e}")
+        return _response_from_entry(url, entry)
+
+    metrics.record_cache(url, "miss")
+    if response.status_code == 200:
+        try:
+            cache.store(key, response.status_code, response.headers, response.content)
+        except sqlite3.Error as e:
+            logging.warning(f"Disk cache store failed: {e}")
+
+    return response
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+# -------------------------------
+# Decode-once JSON responses
+# -------------------------------
+_NOT_DECODED = object()
+
+
+class JSONResponse:
+    """A response whose JSON body is decoded at most once.
+
+    json() memoizes the result; anything else (status_code, headers, ...) is
+    read from the wrapped response.
+    """
+
+    def __init__(self, response):
+        self.response = response
+        self._data = _NOT_DECODED
+
+    def json(self):
+        if self._data is _NOT_DECODED:
+            self._data = codec.decode_response(self.response)
+        return self._data
+
+    @property
+    def found(self):
+        """200 with a non-empty body (JSONPlaceholder answers unknown ids with 404 {})."""
+        return self.response.status_code == 200 and bool(self.json())
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+
+def get_json(url, **kwargs):
+    """get() wrapped in a JSONResponse."""
+    return JSONResponse(get(url, **kwargs))
+
+
+def get_with_embeds(url, embed=(), expand=(), **kwargs):
+    """Fetch a resource and its related resources in one request.
+
+    Uses JSONPlaceholder's _embed (children, e.g. a post's "comments") and
+    _expand (parent, e.g. a post's "user"). Returns a JSONResponse.
+    """
+    params = kwargs.pop("params", None) or {}
+    params = list(params.items() if isinstance(params, dict) else params)
+    for key, names in (("_embed", embed), ("_expand", expand)):
+        params += [(key, name) for name in ([names] if isinstance(names, str) else names)]
+    return get_json(url, params=params, **kwargs)
+
+
+# -------------------------------
+# Disk cache
+# -------------------------------
+def get_disk_cache():
+    """Return the shared disk cache, or None when it is turned off.
+
+    If the cache file can't be opened (unwritable home, locked database) it
+    is turned off for the rest of the run, with one warning.
+    """
+    global _disk_cache, DISK_CACHE_ENABLED
+
+    if not DISK_CACHE_ENABLED:
+        return None
+    with _lock:
+        if _disk_cache is None and DISK_CACHE_ENABLED:
+            try:
+                _disk_cache = DiskCache()
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Disk cache unavailable, continuing without it: {e}")
+                DISK_CACHE_ENABLED = False
+    return _disk_cache
+
+
+def enable_disk_cache(path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+    """Turn the disk cache on, optionally at another path or size cap."""
+    global _disk_cache, DISK_CACHE_ENABLED
+
+    with _lock:
+        if _disk_cache is not None:
+            _disk_cache.close()
+        _disk_cache = DiskCache(path, max_bytes)
+        DISK_CACHE_ENABLED = True
+
+
+def disable_disk_cache():
+    global _disk_cache, DISK_CACHE_ENABLED
+
+    with _lock:
+        if _disk_cache is not None:
+            _disk_cache.close()
+        _disk_cache = None
+        DISK_CACHE_ENABLED = False
+
+
+def _response_from_entry(url, entry):
+    """Rebuild a requests.Response from a stored cache entry."""
+    response = requests.Response()
+    response.url = url
+    response.status_code = entry["status"]
+    response.reason = "OK"
+    response._content = entry["body"]
+
+    headers = CaseInsensitiveDict(entry["headers"])
+    # The stored body is already decoded
+    headers.pop("Content-Encoding", None)
+    headers["Content-Length"] = str(len(entry["body"]))
+    response.headers = headers
+
+    response.from_disk_cache = True
+    return response
+
+
+# -------------------------------
+# Connection stats
+# -------------------------------
+def connection_stats():
+    """Count requests sent, connections opened and connections re-used."""
+    total_requests = 0
+    new_connections = 0
+
+    with _lock:
+        sessions = list(_sessions.values())
+
+    for session in sessions:
+        for adapter in set(session.adapters.values()):
+            if isinstance(adapter, HTTP2Adapter):
+                total_requests += adapter.num_requests
+                new_connections += adapter.num_connections
+                continue
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+
+    return {
+        "requests": total_requests,
+        "new_connections": new_connections,
+        "reused_connections": max(0, total_requests - new_connections),
+    }
+
+
+def close():
+    """Close every pooled session."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+
+    for session in sessions:
+        session.close()
@@ -0,0 +1,351 @@
+"""
+Async Dashboard
+===============
+The part5 dashboard without the freezes: requests run as asyncio tasks, a
+spinner line shows how long each one has been running, and panels are
+printed as soon as their data arrives.
+
+Learn:
+- Running blocking calls as cancellable tasks (asyncio.to_thread)
+- Showing progress while waiting (a spinner redrawn in place)
+- Ctrl-C cancels the requests in flight only; at the menu it quits
+- Loading several panels at once and rendering each as it finishes
+
+Run it:
+    python async_dashboard.py
+
+A cancelled request stops being waited on straight away; its worker thread
+finishes in the background (bounded by the request timeout) and the result
+is dropped. The action carries on without it (a panel shows n/a). Ctrl-C
+while an action waits for input cancels the action.
+
+The part3 lookups (users, posts, todos) are on the menu too, so this is also
+the async mode of part3_user_input.py (python part3_user_input.py --async).
+"""
+
+import asyncio
+import shutil
+import signal
+import sys
+import time
+
+from metrics import metrics
+from part3_user_input import COMPLETED, check_user_id, fetch_user, iter_posts, iter_todos, user_lines
+from part5_real_api import (
+    BULK_THRESHOLD,
+    CITIES,
+    CRYPTO_IDS,
+    crypto_table_lines,
+    get_crypto_price,
+    get_weather,
+    get_weather_many,
+    ticker_index,
+    weather_board_lines,
+)
+
+SPINNER_FRAMES = "|/-\\"
+SPINNER_INTERVAL = 0.1  # Seconds between redraws
+
+CANCELLED = object()  # What fetch() returns for a request dropped with Ctrl-C
+
+
+# -------------------------------
+# Progress line
+# -------------------------------
+class Activity:
+    """Requests in flight, drawn as one spinner line with each request's elapsed time."""
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+        self.enabled = stream.isatty()  # No spinner when output is piped
+        self._pending = {}  # token -> (label, started)
+        self._next_token = 0
+        self._drawn = False
+
+    def start(self, label):
+        self._next_token += 1
+        self._pending[self._next_token] = (label, time.monotonic())
+        return self._next_token
+
+    def finish(self, token):
+        self._pending.pop(token, None)
+        if not self._pending:
+            self.clear()
+
+    def clear(self):
+        if self._drawn:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+            self._drawn = False
+
+    def print(self, lines):
+        """Print lines above the spinner."""
+        self.clear()
+        print("\n".join(lines), file=self.stream, flush=True)
+
+    def draw(self, frame):
+        if not self.enabled or not self._pending:
+            return
+        now = time.monotonic()
+        parts = [f"{label} {now - started:.1f}s" for label, started in self._pending.values()]
+        width = shutil.get_terminal_size().columns - 1
+        line = f"{SPINNER_FRAMES[frame % len(SPINNER_FRAMES)]} {len(parts)} loading: " + ", ".join(parts)
+        self.stream.write("\r\033[K" + line[:width])
+        self.stream.flush()
+        self._drawn = True
+
+    async def run(self):
+        frame = 0
+        while True:
+            self.draw(frame)
+            frame += 1
+            await asyncio.sleep(SPINNER_INTERVAL)
+
+
+# -------------------------------
+# Dashboard
+# -------------------------------
+class AsyncDashboard:
+    def __init__(self, cities=None, coins=None):
+        self.cities = cities or list(CITIES)
+        self.coins = coins or list(CRYPTO_IDS)
+        self.activity = Activity()
+        self._action = None  # Task for the menu choice being run
+        self._main = None
+        self._requests = set()  # fetch() tasks in flight
+        self._dropped = set()   # ...and those Ctrl-C cancelled
+
+    async def fetch(self, label, fn, *args, **kwargs):
+        """Run a blocking call in a worker thread, shown on the spinner line.
+
+        Returns CANCELLED if Ctrl-C dropped the request.
+        """
+        token = self.activity.start(label)
+        request = asyncio.ensure_future(asyncio.to_thread(fn, *args, **kwargs))
+        self._requests.add(request)
+        try:
+            return await request
+        except asyncio.CancelledError:
+            if request not in self._dropped:
+                raise  # The whole action is being cancelled
+            self.activity.print([f"Cancelled {label}."])
+            return CANCELLED
+        finally:
+            self._requests.discard(request)
+            self._dropped.discard(request)
+            self.activity.finish(token)
+
+    # -------------------------------
+    # Panels
+    # -------------------------------
+    async def weather_panel(self, cities):
+        results = await self.fetch(f"weather x{len(cities)}", get_weather_many, cities)
+        if results is CANCELLED:
+            results = {city.lower().strip(): None for city in cities}
+        return weather_board_lines(results)
+
+    async def crypto_panel(self, coins):
+        if len(coins) >= BULK_THRESHOLD:
+            tickers = await self.fetch(f"tickers x{len(coins)}", ticker_index.lookup_many, coins)
+            if tickers is CANCELLED:
+                tickers = []
+        else:
+            # One request per coin, each with its own timer on the spinner line
+            tickers = await asyncio.gather(*(self.fetch(coin, get_crypto_price, coin) for coin in coins))
+        return crypto_table_lines([t for t in tickers if t is not CANCELLED])
+
+    async def show_panels(self, *panels):
+        """Run panels at the same time and print each one as it finishes."""
+        tasks = [asyncio.ensure_future(panel) for panel in panels]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                self.activity.print(await next_done)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # -------------------------------
+    # Menu actions
+    # -------------------------------
+    async def overview(self):
+        await self.show_panels(self.weather_panel(self.cities), self.crypto_panel(self.coins))
+
+    async def city_weather(self):
+        print(f"Available: {', '.join(CITIES.keys())}")
+        city = await ainput("Enter city: ")
+        weather = await self.fetch(f"weather {city.strip()}", get_weather, city)
+        if weather and weather is not CANCELLED:
+            self.activity.print([
+                f"\n{'=' * 40}",
+                f"  Weather in {city.strip().title()}",
+                f"{'=' * 40}",
+                f"  Temperature: {weather.temperature}°C",
+                f"  Wind Speed: {weather.windspeed} km/h",
+                f"{'=' * 40}",
+            ])
+
+    async def compare(self):
+        coins = [c.strip() for c in (await ainput("Enter coins (comma separated): ")).split(",") if c.strip()]
+        await self.show_panels(self.crypto_panel(coins))
+
+    # part3 lookups
+    async def user_info(self):
+        user_id = check_user_id(await ainput("Enter user ID (1-10): "))
+        if not user_id:
+            return
+        user = await self.fetch(f"user {user_id}", fetch_user, user_id)
+        if user is not CANCELLED:
+            self.activity.print(user_lines(user_id, user))
+
+    async def search_posts(self):
+        user_id = check_user_id(await ainput("Enter user ID to see their posts (1-10): "))
+        if not user_id:
+            return
+        posts = await self.fetch(f"posts of user {user_id}", lambda: list(iter_posts(user_id)))
+        if posts is CANCELLED:
+            return
+        if not posts:
+            self.activity.print(["No posts found for this user."])
+            return
+        self.activity.print([f"\n--- Posts by User #{user_id} ---"]
+                            + [f"{i}. {post.title}" for i, post in enumerate(posts, 1)])
+
+    async def search_todos(self):
+        completed = COMPLETED.get((await ainput("Show completed todos? (yes/no): ")).lower())
+        if completed is None:
+            print("Invalid choice!")
+            return
+        todos = await self.fetch("todos", lambda: list(iter_todos(completed)))
+        if todos is not CANCELLED:
+            self.activity.print([f"\nTodos (completed = {completed})"]
+                                + [f"- {todo.title}" for todo in todos])
+
+    async def run_action(self, action):
+        """Run one menu action; Ctrl-C while it waits for input cancels only this action."""
+        self._action = asyncio.ensure_future(action())
+        try:
+            await asyncio.wait({self._action})
+        finally:
+            if not self._action.done():
+                self._action.cancel()
+
+        if self._action.cancelled():
+            self.activity.print(["\nCancelled."])
+        elif self._action.exception() is not None:
+            self.activity.print([f"\nError: {self._action.exception()}"])
+        self._action = None
+
+    def interrupt(self):
+        """SIGINT: drop the requests in flight, else cancel the running action, else quit."""
+        requests = [request for request in self._requests if not request.done()]
+        if requests:
+            for request in requests:
+                self._dropped.add(request)
+                request.cancel()
+        elif self._action is not None and not self._action.done():
+            self._action.cancel()
+        elif self._main is not None:
+            self._main.cancel()
+
+    async def run(self):
+        self._main = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        _install_sigint(loop, self.interrupt)
+        spinner = asyncio.create_task(self.activity.run())
+
+        actions = {
+            "1": self.overview,
+            "2": self.city_weather,
+            "3": self.compare,
+            "4": self.user_info,
+            "5": self.search_posts,
+            "6": self.search_todos,
+        }
+
+        print("\n" + "=" * 50)
+        print("   Real-World API Dashboard (async)")
+        print("=" * 50)
+        print("Ctrl-C cancels a running request; at the menu it exits.")
+
+        try:
+            while True:
+                print("\nOptions:")
+                print("  1. Overview (weather + crypto)")
+                print("  2. Check Weather")
+                print("  3. Compare Cryptos")
+                print("  4. Look up User")
+                print("  5. Search Posts by User")
+                print("  6. Search Todos")
+                print("  7. Show Request Metrics")
+                print("  8. Exit")
+
+                choice = (await ainput("\nSelect (1-8): ")).strip()
+
+                if choice in actions:
+                    await self.run_action(actions[choice])
+                elif choice == "7":
+                    metrics.print_summary()
+                elif choice == "8":
+                    break
+                else:
+                    print("Invalid option.")
+        except (asyncio.CancelledError, EOFError):
+            pass
+        finally:
+            spinner.cancel()
+            self.activity.clear()
+            _remove_sigint(loop)
+
+        print("\nGoodbye! Happy coding!")
+
+
+# -------------------------------
+# Terminal plumbing
+# -------------------------------
+async def ainput(prompt=""):
+    """input() that doesn't block the event loop (and can be cancelled on Unix)."""
+    loop = asyncio.get_running_loop()
+    print(prompt, end="", flush=True)
+
+    try:
+        if not sys.stdin.isatty():
+            raise NotImplementedError
+        fd = sys.stdin.fileno()
+        ready = loop.create_future()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+    except (NotImplementedError, OSError, ValueError):
+        # Piped input, or a Windows event loop that can't watch stdin: read in a thread
+        line = await asyncio.to_thread(sys.stdin.readline)
+    else:
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+        line = sys.stdin.readline()
+
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+def _install_sigint(loop, handler):
+    try:
+        loop.add_signal_handler(signal.SIGINT, handler)
+    except NotImplementedError:
+        # Windows: a plain signal handler that hands over to the loop
+        signal.signal(signal.SIGINT, lambda *_: loop.call_soon_threadsafe(handler))
+
+
+def _remove_sigint(loop):
+    try:
+        loop.remove_signal_handler(signal.SIGINT)
+    except NotImplementedError:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+
+def async_dashboard(cities=None, coins=None):
+    asyncio.run(AsyncDashboard(cities, coins).run())
+
+
+if __name__ == "__main__":
+    async_dashboard()
@@ -0,0 +1,316 @@
+"""
+Mock API Server
+===============
+A local stand-in for the APIs the practice files call, so benchmarks don't
+depend on (or hammer) the real services.
+
+Endpoints:
+- JSONPlaceholder: /posts, /users, /todos, /comments and /<collection>/<id>
+  (filters, _page/_limit, _start/_end, _embed/_expand, X-Total-Count and Link headers)
+- coinpaprika: /v1/tickers and /v1/tickers/<coin_id>
+- Open-Meteo: /v1/forecast (comma-separated latitude/longitude lists)
+
+Bodies over 1 KB are gzipped when the client accepts it (--no-compress to turn off).
+
+Run it on its own:
+    python benchmarks/mock_server.py --port 8765 --latency 50 --jitter 10 --error-rate 0.01
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+COMPRESS_MIN_BYTES = 1024
+
+# Coins the practice files know by name, always present in /v1/tickers
+KNOWN_COINS = [
+    ("btc-bitcoin", "Bitcoin", "BTC"),
+    ("eth-ethereum", "Ethereum", "ETH"),
+    ("doge-dogecoin", "Dogecoin", "DOGE"),
+    ("ada-cardano", "Cardano", "ADA"),
+    ("sol-solana", "Solana", "SOL"),
+    ("xrp-xrp", "XRP", "XRP"),
+]
+
+
+class Settings:
+    """Behaviour knobs, shared by all request handler threads."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, items=100,
+                 body_bytes=200, tickers=2000, compress=True):
+        self.latency = latency        # Seconds added to every response
+        self.jitter = jitter          # +/- seconds of random extra latency
+        self.error_rate = error_rate  # Fraction of requests answered with 503
+        self.items = items            # Number of posts (todos x2, comments x5)
+        self.body_bytes = body_bytes  # Length of each post/comment body
+        self.tickers = tickers        # Number of coins in /v1/tickers
+        self.compress = compress      # gzip large bodies if Accept-Encoding allows
+
+
+def build_data(settings):
+    """Generate every collection once, up front."""
+    rng = random.Random(42)
+    text = ("lorem ipsum dolor sit amet " * (settings.body_bytes // 27 + 1))[:settings.body_bytes]
+
+    users = [{
+        "id": i,
+        "name": f"User {i}",
+        "username": f"user{i}",
+        "email": f"user{i}@example.com",
+        "address": {"street": "Main St", "suite": f"Apt. {i}", "city": f"City {i}",
+                    "zipcode": "00000", "geo": {"lat": "0", "lng": "0"}},
+        "phone": f"555-000-{i:04d}",
+        "website": f"user{i}.example.com",
+        "company": {"name": f"Company {i}", "catchPhrase": "", "bs": ""},
+    } for i in range(1, 11)]
+
+    posts = [{"userId": (i - 1) % 10 + 1, "id": i, "title": f"post title {i}", "body": text}
+             for i in range(1, settings.items + 1)]
+    todos = [{"userId": (i - 1) % 10 + 1, "id": i, "title": f"todo {i}", "completed": i % 3 == 0}
+             for i in range(1, settings.items * 2 + 1)]
+    comments = [{"postId": (i - 1) // 5 + 1, "id": i, "name": f"comment {i}",
+                 "email": f"c{i}@example.com", "body": text}
+                for i in range(1, settings.items * 5 + 1)]
+
+    coins = list(KNOWN_COINS)
+    coins += [(f"c{i}-coin{i}", f"Coin {i}", f"C{i}") for i in range(len(coins), settings.tickers)]
+    tickers = []
+    for rank, (coin_id, name, symbol) in enumerate(coins, 1):
+        tickers.append({
+            "id": coin_id,
+            "name": name,
+            "symbol": symbol,
+            "rank": rank,
+            "circulating_supply": rng.randint(10**6, 10**9),
+            "total_supply": rng.randint(10**9, 10**10),
+            "last_updated": "2024-01-01T00:00:00Z",
+            "quotes": {"USD": {
+                "price": round(rng.uniform(0.01, 50000), 4),
+                "volume_24h": rng.uniform(10**6, 10**10),
+                "market_cap": rng.uniform(10**7, 10**12),
+                "percent_change_1h": round(rng.uniform(-2, 2), 2),
+                "percent_change_24h": round(rng.uniform(-10, 10), 2),
+                "percent_change_7d": round(rng.uniform(-20, 20), 2),
+            }},
+        })
+
+    return {
+        "users": users,
+        "posts": posts,
+        "todos": todos,
+        "comments": comments,
+        "tickers": tickers,
+        "tickers_by_id": {t["id"]: t for t in tickers},
+    }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+    settings = None
+    data = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # -------------------------------
+    # Plumbing
+    # -------------------------------
+    def _send(self, status, payload=None, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        accepted = self.headers.get("Accept-Encoding", "")
+        gzipped = (self.settings.compress and len(body) >= COMPRESS_MIN_BYTES
+                   and "gzip" in accepted)
+        if gzipped:
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _simulate(self):
+        """Sleep for the configured latency; True if this request should fail."""
+        s = self.settings
+        delay = s.latency + random.uniform(-s.jitter, s.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        return random.random() < s.error_rate
+
+    def do_GET(self):
+        if self._simulate():
+            self._send(503, {"error": "simulated failure"}, {"Retry-After": "1"})
+            return
+
+        parts = urlsplit(self.path)
+        self._multi = parse_qs(parts.query)
+        query = {k: v[-1] for k, v in self._multi.items()}
+        segments = [s for s in parts.path.split("/") if s]
+
+        if segments[:2] == ["v1", "tickers"]:
+            self._tickers(segments[2:])
+        elif segments[:2] == ["v1", "forecast"]:
+            self._forecast(query)
+        elif segments and segments[0] in ("posts", "users", "todos", "comments"):
+            self._collection(segments, query)
+        else:
+            self._send(404, {})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self._simulate():
+            self._send(503, {"error": "simulated failure"})
+            return
+        self._send(201, {**payload, "id": len(self.data["posts"]) + 1})
+
+    # -------------------------------
+    # Endpoints
+    # -------------------------------
+    def _tickers(self, rest):
+        if not rest:
+            self._send(200, self.data["tickers"])
+            return
+        ticker = self.data["tickers_by_id"].get(rest[0])
+        if ticker is None:
+            self._send(404, {"error": "id not found"})
+        else:
+            self._send(200, ticker)
+
+    def _forecast(self, query):
+        try:
+            lats = [float(v) for v in query["latitude"].split(",")]
+            lons = [float(v) for v in query["longitude"].split(",")]
+        except (KeyError, ValueError):
+            self._send(400, {"error": True, "reason": "latitude/longitude required"})
+            return
+
+        locations = [{
+            "latitude": lat,
+            "longitude": lon,
+            "timezone": "GMT",
+            "current_weather": {
+                "time": "2024-01-01T00:00",
+                "temperature": round(20 + lat / 10, 1),
+                "windspeed": round(abs(lon) / 20, 1),
+                "winddirection": 180,
+                "weathercode": 0,
+            },
+        } for lat, lon in zip(lats, lons)]
+        self._send(200, locations[0] if len(locations) == 1 else locations)
+
+    def _related(self, name, item, query):
+        """Copy of item with _embed (children) and _expand (parent) resources added."""
+        if "_embed" not in query and "_expand" not in query:
+            return item
+        item = dict(item)
+        foreign_key = f"{name[:-1]}Id"  # posts -> postId
+        for child in query.get("_embed", []):
+            if child in self.data:
+                item[child] = [c for c in self.data[child] if c.get(foreign_key) == item["id"]]
+        for parent in query.get("_expand", []):
+            parents = self.data.get(f"{parent}s", [])
+            item[parent] = next((p for p in parents if p["id"] == item.get(f"{parent}Id")), None)
+        return item
+
+    def _collection(self, segments, query):
+        name = segments[0]
+        items = self.data[name]
+
+        if len(segments) >= 2:
+            item = next((i for i in items if str(i["id"]) == segments[1]), None)
+            if item is None:
+                self._send(404, {})
+            elif len(segments) == 3 and name == "posts" and segments[2] == "comments":
+                self._send(200, [c for c in self.data["comments"] if c["postId"] == item["id"]])
+            else:
+                self._send(200, self._related(name, item, self._multi))
+            return
+
+        filters = {k: v for k, v in query.items() if not k.startswith("_")}
+        if "_embed" in self._multi or "_expand" in self._multi:
+            items = [self._related(name, i, self._multi) for i in items]
+        if filters:
+            items = [i for i in items
+                     if all(str(i.get(k)).lower() == v.lower() for k, v in filters.items())]
+
+        total = len(items)
+        headers = {"X-Total-Count": str(total)}
+
+        if "_page" in query:
+            limit = int(query.get("_limit", 10))
+            page = int(query["_page"])
+            items = items[(page - 1) * limit:page * limit]
+            if page * limit < total:
+                next_query = urlencode({**query, "_page": page + 1})
+                headers["Link"] = f'<http://{self.headers["Host"]}/{name}?{next_query}>; rel="next"'
+        elif "_start" in query or "_end" in query:
+            start = int(query.get("_start", 0))
+            items = items[start:int(query.get("_end", total))]
+        elif "_limit" in query:
+            items = items[:int(query["_limit"])]
+
+        self._send(200, items, headers)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping pooled keep-alive connections is normal here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_server(host="127.0.0.1", port=0, **settings):
+    """Start the mock server on a background thread. Returns (server, base_url)."""
+    handler = type("Handler", (MockHandler,), {})
+    handler.settings = Settings(**settings)
+    handler.data = build_data(handler.settings)
+
+    server = MockServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="mock-api", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the APIs used by the practice files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- milliseconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--items", type=int, default=100, help="number of posts (todos x2, comments x5)")
+    parser.add_argument("--body-bytes", type=int, default=200, help="length of each post/comment body")
+    parser.add_argument("--tickers", type=int, default=2000, help="number of coins in /v1/tickers")
+    parser.add_argument("--no-compress", action="store_true", help="never gzip responses")
+    args = parser.parse_args()
+
+    server, base_url = start_server(
+        args.host, args.port,
+        latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate,
+        items=args.items, body_bytes=args.body_bytes, tickers=args.tickers,
+        compress=not args.no_compress,
+    )
+    print(f"Mock API listening on {base_url} (Ctrl-C to stop)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
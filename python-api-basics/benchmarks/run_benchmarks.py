@@ -0,0 +1,333 @@
+"""
+API Benchmarks
+==============
+Runs the practice-file functions against the local mock server at several
+concurrency levels and reports latency percentiles, throughput and peak memory.
+
+Learn:
+- Benchmarking against a local mock, not the real (rate-limited) APIs
+- p50 / p95 / p99 latency and operations per second
+- Measuring peak memory with tracemalloc (in its own pass, it slows things down)
+
+Usage:
+    python benchmarks/run_benchmarks.py --latency 20 --jitter 5 --concurrency 1,8,32
+    python benchmarks/run_benchmarks.py --only weather --compare benchmarks/results/old.json
+
+Results are saved as JSON (benchmarks/results/<timestamp>.json by default).
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from mock_server import start_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+DEFAULT_CONCURRENCY = (1, 8, 32)
+DEFAULT_ITERATIONS = 30
+ASYNC_BATCH = 50  # URLs per async_fetch_all call
+
+
+# -------------------------------
+# Mock server (separate process, so it doesn't share our GIL)
+# -------------------------------
+def _serve(queue, settings):
+    _, base_url = start_server(**settings)
+    queue.put(base_url)
+    threading.Event().wait()
+
+
+def launch_server(settings):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(queue, settings), daemon=True)
+    process.start()
+    return process, queue.get(timeout=30)
+
+
+def import_parts(base_url):
+    """Point the practice files at the mock server, then import them."""
+    os.environ["OPEN_METEO_API"] = base_url
+    os.environ["COINPAPRIKA_API"] = base_url
+    os.environ["JSONPLACEHOLDER_API"] = base_url
+    os.environ["API_DISK_CACHE"] = "0"  # Every request should reach the server
+    sys.path.insert(0, ROOT)
+
+    import part4_error_handling
+    import part5_real_api
+
+    # part4 logs every attempt at INFO
+    logging.getLogger().setLevel(logging.ERROR)
+    return part4_error_handling, part5_real_api
+
+
+# -------------------------------
+# Scenarios
+# -------------------------------
+class Scenario:
+    """A named operation. op(i) does one unit of work and returns True on success."""
+
+    def __init__(self, name, op, requests_per_op=1, concurrency=None, setup=None):
+        self.name = name
+        self.op = op
+        self.requests_per_op = requests_per_op
+        self.concurrency = concurrency  # None: run at every --concurrency level
+        self.setup = setup              # Called before each op (e.g. to clear caches)
+
+
+def build_scenarios(base_url, part4, part5, levels):
+    import asyncio
+    from cache import response_cache
+    from pagination import iter_items
+    from streaming import stream_json_items
+
+    cities = list(part5.CITIES)
+    coins = list(part5.CRYPTO_IDS)
+
+    def quiet(fn, *args, **kwargs):
+        # Swaps sys.stdout, so only for scenarios that run one op at a time
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args, **kwargs)
+
+    def cold_index():
+        part5.ticker_index.loaded_at = None
+
+    scenarios = [
+        Scenario("safe_api_request /posts/:id",
+                 lambda i: part4.safe_api_request(f"{base_url}/posts/{i % 100 + 1}")["success"]),
+    ]
+    for collection in ("posts", "users", "todos"):
+        scenarios.append(Scenario(
+            f"fetch collection /{collection}",
+            lambda i, c=collection: part4.safe_api_request(f"{base_url}/{c}")["success"],
+        ))
+
+    # Concurrency lives inside these calls, so they run one op at a time
+    urls = [f"{base_url}/posts/{n}" for n in range(1, ASYNC_BATCH + 1)]
+    for limit in levels:
+        scenarios.append(Scenario(
+            f"async_fetch_all x{ASYNC_BATCH} (limit={limit})",
+            lambda i, l=limit: all(
+                r["success"] for r in asyncio.run(part4.async_fetch_all(urls, limit=l))
+            ),
+            requests_per_op=ASYNC_BATCH, concurrency=1,
+        ))
+    for limit in levels:
+        scenarios.append(Scenario(
+            f"compare_cryptos x{len(coins)} (max_workers={limit})",
+            lambda i, l=limit: len(quiet(part5.compare_cryptos, coins, concurrent=True, max_workers=l)) == len(coins),
+            requests_per_op=len(coins), concurrency=1, setup=response_cache.clear,
+        ))
+
+    scenarios += [
+        Scenario(f"compare_cryptos x{len(coins)} (bulk)",
+                 lambda i: len(quiet(part5.compare_cryptos, coins, bulk=True)) == len(coins),
+                 concurrency=1, setup=cold_index),
+        # Rotate cities so concurrent calls aren't merged by single-flight
+        Scenario("get_weather",
+                 lambda i: part5.get_weather(cities[i % len(cities)], use_cache=False) is not None),
+        Scenario(f"get_weather_many x{len(cities)}",
+                 lambda i: all(part5.get_weather_many(cities, use_cache=False).values()),
+                 concurrency=1),
+        Scenario("stream_json_items /comments (first 10)",
+                 lambda i: len(list(stream_json_items(f"{base_url}/comments", limit=10))) == 10),
+        Scenario("full fetch /comments",
+                 lambda i: part4.safe_api_request(f"{base_url}/comments")["success"]),
+        Scenario("iter_items /posts (page_size=20)",
+                 lambda i: sum(1 for _ in iter_items(f"{base_url}/posts", page_size=20)) > 0,
+                 concurrency=1),
+    ]
+    return scenarios
+
+
+# -------------------------------
+# Running
+# -------------------------------
+def percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _run_ops(scenario, concurrency, iterations):
+    """Run the op `iterations` times, `concurrency` at once. Returns (latencies, errors, wall)."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(i):
+        nonlocal errors
+        if scenario.setup is not None:
+            scenario.setup()
+        start = time.perf_counter()
+        try:
+            ok = scenario.op(i)
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            errors += not ok
+
+    start = time.perf_counter()
+    if concurrency == 1:
+        for i in range(iterations):
+            timed(i)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed, range(iterations)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def run_scenario(scenario, concurrency, iterations, measure_memory=True):
+    from circuit_breaker import reset_breakers
+    from metrics import metrics
+
+    reset_breakers()
+    _run_ops(scenario, 1, 1)  # Warm up: open connections, fill lazy state
+
+    metrics.reset()
+    latencies, errors, wall = _run_ops(scenario, concurrency, iterations)
+    latencies.sort()
+    endpoints = metrics.as_dict()["endpoints"]
+
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        _run_ops(scenario, concurrency, iterations)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "iterations": iterations,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "ops_per_second": iterations / wall,
+        "requests_per_second": iterations * scenario.requests_per_op / wall,
+        "peak_memory_kb": None if peak is None else peak / 1024,
+        # Response bodies per op, as transferred and after decompression
+        "wire_kb_per_op": sum(e["bytes_in"] for e in endpoints) / iterations / 1024,
+        "decoded_kb_per_op": sum(e["bytes_decoded"] for e in endpoints) / iterations / 1024,
+    }
+
+
+def print_row(r):
+    memory = "-" if r["peak_memory_kb"] is None else f"{r['peak_memory_kb']:,.0f}"
+    print(f"  {r['scenario'][:44]:<45}{r['concurrency']:>5}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+          f"{r['p99_ms']:>9.1f}{r['ops_per_second']:>9.1f}{r['requests_per_second']:>9.1f}"
+          f"{memory:>11}{r['wire_kb_per_op']:>9.1f}{r['errors']:>6}")
+
+
+def print_header():
+    print(f"\n  {'Scenario':<45}{'Conc':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'ops/s':>9}{'req/s':>9}{'peak KB':>11}{'wire KB':>9}{'Err':>6}")
+    print(f"  {'-' * 121}")
+
+
+def print_comparison(results, previous):
+    """p50 and throughput change against an earlier results file."""
+    before = {(r["scenario"], r["concurrency"]): r for r in previous["results"]}
+
+    print(f"\n  {'Scenario':<45}{'Conc':>5}{'p50 before':>12}{'p50 now':>10}{'change':>9}{'req/s change':>14}")
+    print(f"  {'-' * 95}")
+    for r in results:
+        old = before.get((r["scenario"], r["concurrency"]))
+        if old is None:
+            continue
+        p50_change = (r["p50_ms"] - old["p50_ms"]) / old["p50_ms"] if old["p50_ms"] else 0.0
+        rps_change = ((r["requests_per_second"] - old["requests_per_second"]) / old["requests_per_second"]
+                      if old["requests_per_second"] else 0.0)
+        print(f"  {r['scenario'][:44]:<45}{r['concurrency']:>5}{old['p50_ms']:>12.1f}"
+              f"{r['p50_ms']:>10.1f}{p50_change:>+9.0%}{rps_change:>+14.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the practice files against a local mock API")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)),
+                        help="comma-separated concurrency levels")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="operations per measurement")
+    parser.add_argument("--only", help="run only scenarios whose name contains this text")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--latency", type=float, default=20.0, help="mock server latency in milliseconds")
+    parser.add_argument("--jitter", type=float, default=5.0, help="+/- milliseconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--items", type=int, default=100, help="number of posts (todos x2, comments x5)")
+    parser.add_argument("--body-bytes", type=int, default=200, help="length of each post/comment body")
+    parser.add_argument("--tickers", type=int, default=2000, help="number of coins in /v1/tickers")
+    parser.add_argument("--no-compress", action="store_true", help="mock server never gzips responses")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    server_settings = {
+        "latency": args.latency / 1000,
+        "jitter": args.jitter / 1000,
+        "error_rate": args.error_rate,
+        "items": args.items,
+        "body_bytes": args.body_bytes,
+        "tickers": args.tickers,
+        "compress": not args.no_compress,
+    }
+
+    process, base_url = launch_server(server_settings)
+    try:
+        part4, part5 = import_parts(base_url)
+        import codec
+
+        scenarios = build_scenarios(base_url, part4, part5, levels)
+        if args.only:
+            scenarios = [s for s in scenarios if args.only.lower() in s.name.lower()]
+
+        print(f"Mock API at {base_url}: latency {args.latency:g}ms +/- {args.jitter:g}ms, "
+              f"error rate {args.error_rate:.1%}")
+        print_header()
+
+        results = []
+        for scenario in scenarios:
+            for concurrency in ([scenario.concurrency] if scenario.concurrency else levels):
+                result = run_scenario(scenario, concurrency, args.iterations, not args.no_memory)
+                results.append(result)
+                print_row(result)
+    finally:
+        process.terminate()
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": server_settings,
+        "iterations": args.iterations,
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "wb") as f:
+        f.write(codec.dumps(report))
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        with open(args.compare, "rb") as f:
+            print_comparison(results, codec.loads(f.read()))
+
+
+if __name__ == "__main__":
+    main()
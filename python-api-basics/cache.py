@@ -0,0 +1,170 @@
+"""
+Response Cache
+==============
+In-process cache for API responses that don't change every second.
+
+Learn:
+- Time-to-live (TTL) expiry
+- Least-recently-used (LRU) eviction with a bounded size
+- Hit/miss counters to see if the cache is worth it
+- Stale-while-revalidate: answer with slightly old data, refresh in the background
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+# Returned by get() when there is no usable entry (None can be a real value)
+MISSING = object()
+
+# A value answered from the cache: fresh is False when it's past its TTL
+Served = namedtuple("Served", ["value", "fresh", "age"])
+
+
+def make_key(url, params=None):
+    """Build a cache key from the URL and its params in sorted order."""
+    if not params:
+        return url
+    items = params.items() if hasattr(params, "items") else params
+    return f"{url}?{urlencode(sorted(items))}"
+
+
+class TTLCache:
+    """Bounded cache where every entry expires after its own TTL.
+
+    An entry set with stale_ttl is kept that much longer after it stops being
+    fresh. get() ignores it then, but get_served() can still return it.
+    """
+
+    def __init__(self, max_size=256, default_ttl=60):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (stored_at, fresh_until, stale_until, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key, now):
+        """Entry for key, dropping it if it's past its stale window. Lock held."""
+        entry = self._entries.get(key)
+        if entry is not None and now >= entry[2]:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._lookup(key, now)
+            if entry is None or now >= entry[1]:
+                self.misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def get_served(self, key):
+        """Served(value, fresh, age) for a fresh or stale entry, or MISSING."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._lookup(key, now)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+
+            stored_at, fresh_until, _, value = entry
+            fresh = now < fresh_until
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            self._entries.move_to_end(key)
+            return Served(value, fresh, now - stored_at)
+
+    def set(self, key, value, ttl=None, stale_ttl=0):
+        if ttl is None:
+            ttl = self.default_ttl
+
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, now + ttl, now + ttl + stale_ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared cache used by the weather and crypto lookups
+response_cache = TTLCache(max_size=256)
+
+
+# -------------------------------
+# Stale-while-revalidate
+# -------------------------------
+_revalidate_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="revalidate")
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def _revalidate(cache, key, fetch, ttl, stale_ttl):
+    try:
+        cache.set(key, fetch(), ttl=ttl, stale_ttl=stale_ttl)
+    except Exception as e:
+        # Upstream still failing: the stale copy stays until its window ends
+        logging.warning(f"Background refresh of {key} failed: {e}")
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(key)
+
+
+def get_stale_while_revalidate(cache, key, fetch, ttl, stale_ttl, on_miss=None):
+    """Answer from cache even if stale, refreshing stale entries in the background.
+
+    Only a miss waits on fetch() (whose exceptions propagate); on_miss() is
+    called first, e.g. to count it. Returns Served.
+    """
+    served = cache.get_served(key)
+
+    if served is MISSING:
+        if on_miss is not None:
+            on_miss()
+        value = fetch()
+        cache.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+        return Served(value, True, 0.0)
+
+    if not served.fresh:
+        with _revalidating_lock:
+            start = key not in _revalidating
+            _revalidating.add(key)
+        if start:
+            _revalidate_pool.submit(_revalidate, cache, key, fetch, ttl, stale_ttl)
+
+    return served
@@ -0,0 +1,146 @@
+"""
+Circuit Breaker
+===============
+Stops calling a host that keeps failing, so callers fail fast instead of
+waiting out every timeout and retry.
+
+Learn:
+- Closed: requests flow normally, failures are counted
+- Open: requests are rejected at once until a cool-down passes
+- Half-open: a few trial requests decide whether to close or re-open
+"""
+
+import threading
+import time
+from collections import deque
+
+from requests.exceptions import RequestException
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+    def __init__(self, host, retry_in):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one host."""
+
+    def __init__(self, host, failure_threshold=0.5, min_requests=5, window=20,
+                 cooldown=30.0, half_open_max=1):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.half_open_max = half_open_max
+
+        self._state = CLOSED
+        self._outcomes = deque(maxlen=window)  # True = failure
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Raise CircuitOpenError if the request must not be sent."""
+        with self._lock:
+            if self._state == OPEN:
+                waited = time.monotonic() - self._opened_at
+                if waited < self.cooldown:
+                    raise CircuitOpenError(self.host, self.cooldown - waited)
+                self._state = HALF_OPEN
+                self._trials = 0
+
+            if self._state == HALF_OPEN:
+                if self._trials >= self.half_open_max:
+                    raise CircuitOpenError(self.host, 0)
+                self._trials += 1
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(False)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(True)
+            if len(self._outcomes) >= self.min_requests and self.failure_rate() >= self.failure_threshold:
+                self._open()
+
+    def release(self):
+        """End a request that says nothing about the host's health.
+
+        In half-open this frees its trial slot, so the next request becomes
+        the trial instead of the breaker waiting forever for an outcome.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def failure_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    @property
+    def state(self):
+        return self._state
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "failure_rate": round(self.failure_rate(), 3),
+                "recent_requests": len(self._outcomes),
+                "retry_in": round(retry_in, 1),
+            }
+
+
+# -------------------------------
+# One breaker per host
+# -------------------------------
+BREAKER_SETTINGS = {}  # Passed to every new CircuitBreaker, e.g. {"cooldown": 10}
+
+_breakers = {}
+_lock = threading.Lock()
+
+
+def get_breaker(host):
+    with _lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, **BREAKER_SETTINGS)
+            _breakers[host] = breaker
+    return breaker
+
+
+def breaker_states():
+    """State of every host's breaker, for monitoring."""
+    with _lock:
+        breakers = list(_breakers.values())
+    return {b.host: b.snapshot() for b in breakers}
+
+
+def reset_breakers():
+    with _lock:
+        _breakers.clear()
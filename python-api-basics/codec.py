@@ -0,0 +1,97 @@
+"""
+JSON Codec
+==========
+One place to decode and encode JSON, using the fastest library installed.
+
+Learn:
+- orjson / msgspec parse JSON several times faster than the json module
+- Decoding straight from response bytes skips building a str copy first
+- Compact output (no indentation) is smaller and quicker to write
+
+Optional speed-ups (the json module is used when neither is installed):
+    pip install orjson
+    pip install msgspec
+"""
+
+import json
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _json_dumps(obj, indent):
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# name -> (loads(bytes) -> obj, dumps(obj, indent) -> bytes)
+BACKENDS = {"json": (json.loads, _json_dumps)}
+
+if msgspec is not None:
+    _msgspec_decoder = msgspec.json.Decoder()
+    _msgspec_encoder = msgspec.json.Encoder()
+
+    def _msgspec_dumps(obj, indent):
+        data = _msgspec_encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    BACKENDS["msgspec"] = (_msgspec_decoder.decode, _msgspec_dumps)
+
+if orjson is not None:
+    def _orjson_dumps(obj, indent):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    BACKENDS["orjson"] = (orjson.loads, _orjson_dumps)
+
+
+def register_backend(name, loads, dumps):
+    """Add a backend: loads(bytes) -> obj and dumps(obj, indent) -> bytes."""
+    BACKENDS[name] = (loads, dumps)
+
+
+def set_backend(name):
+    """Switch every loads/dumps call to the named backend."""
+    global BACKEND, _loads, _dumps
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}, choose from {sorted(BACKENDS)}")
+    BACKEND = name
+    _loads, _dumps = BACKENDS[name]
+
+
+# Fastest available first
+set_backend("orjson" if "orjson" in BACKENDS else "msgspec" if "msgspec" in BACKENDS else "json")
+
+
+def loads(data):
+    """Decode JSON from bytes (preferred) or str."""
+    return _loads(data)
+
+
+def dumps(obj, indent=True):
+    """Encode obj as UTF-8 JSON bytes, indented or compact."""
+    return _dumps(obj, indent)
+
+
+def decode_response(response):
+    """Decode a response body straight from its bytes.
+
+    Raises requests.exceptions.JSONDecodeError like response.json() does,
+    so existing error handling keeps working.
+    """
+    body = response.content
+    try:
+        return _loads(body)
+    except ValueError as e:
+        doc = body.decode("utf-8", errors="replace")
+        raise requests.exceptions.JSONDecodeError(str(e), doc, getattr(e, "pos", 0) or 0)
@@ -0,0 +1,165 @@
+"""
+Persistent HTTP Cache
+=====================
+Stores GET responses in a SQLite file so reruns don't download everything again.
+
+Learn:
+- Cache-Control max-age for freshness
+- ETag / Last-Modified revalidation (304 Not Modified re-uses the stored body)
+- Size-capped storage with least-recently-used eviction
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "python-api-basics", "http_cache.sqlite"
+)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB of response bodies
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def parse_cache_control(value):
+    """Return (storable, max_age) from a Cache-Control header value.
+
+    "private" only forbids shared caches; this one belongs to a single user.
+    """
+    value = (value or "").lower()
+    if "no-store" in value:
+        return False, 0
+    if "no-cache" in value:
+        return True, 0
+
+    match = _MAX_AGE.search(value)
+    return True, int(match.group(1)) if match else 0
+
+
+class DiskCache:
+    """SQLite-backed store of response bodies and their validators."""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                size INTEGER,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL,
+                accessed_at REAL
+            )"""
+        )
+        self._db.commit()
+
+    def lookup(self, key):
+        """Return the stored entry for key as a dict, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, etag, last_modified, expires_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            with self._db:
+                self._db.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+
+        status, headers, body, etag, last_modified, expires_at = row
+        return {
+            "status": status,
+            "headers": json.loads(headers),
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": expires_at,
+        }
+
+    def store(self, key, status, headers, body):
+        """Save a response if its Cache-Control allows it. Returns True if stored."""
+        storable, max_age = parse_cache_control(headers.get("Cache-Control"))
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+
+        # Nothing to gain from an entry that is never fresh and can't be revalidated
+        if not storable or (max_age == 0 and not etag and not last_modified):
+            return False
+
+        now = time.time()
+        # "with self._db" commits, or rolls back if anything fails (e.g. database is locked)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    status,
+                    json.dumps(dict(headers)),
+                    body,
+                    len(body),
+                    etag,
+                    last_modified,
+                    now + max_age,
+                    now,
+                ),
+            )
+            self._evict()
+        return True
+
+    def refresh(self, key, headers):
+        """Extend an entry's freshness after a 304 Not Modified."""
+        _, max_age = parse_cache_control(headers.get("Cache-Control"))
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + max_age, now, key),
+            )
+
+    def _evict(self):
+        """Drop least-recently-used entries until bodies fit in max_bytes."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            count, total = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,145 @@
+"""
+HTTP/2 Transport
+================
+A requests adapter that sends through httpx with HTTP/2, so concurrent calls
+to one host share a single multiplexed connection instead of a pool of sockets.
+
+Learn:
+- HTTP/2 multiplexing: many requests in flight on one TCP + TLS connection
+- Plugging a different transport into requests with a custom adapter
+- Mapping another library's errors onto requests' exceptions
+
+Optional (api_client stays on HTTP/1.1 without it):
+    pip install "httpx[http2]"
+
+Turn it on with API_HTTP2=1 or api_client.configure(http2=True). HTTP/2 is
+agreed during the TLS handshake (ALPN), so it is only used for https:// URLs;
+servers that don't speak it get HTTP/1.1 over the same client.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+    import h2  # noqa: F401  httpx needs it for http2=True
+except ImportError:
+    httpx = None
+
+HTTP2_AVAILABLE = httpx is not None
+
+# Connection-specific headers are not allowed in HTTP/2
+_HOP_BY_HOP = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+
+def _timeout(timeout):
+    """requests timeout (seconds or (connect, read)) as an httpx.Timeout."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class _StreamedBody:
+    """Stands in for response.raw, reading the body from an httpx response."""
+
+    def __init__(self, response, request):
+        self._response = response
+        self._request = request
+        self._chunks = None
+
+    def stream(self, chunk_size, decode_content=True):
+        # httpx has already undone gzip / br / zstd
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=self._request)
+
+    def read(self, amt=None, decode_content=True):
+        if self._chunks is None:
+            self._chunks = self.stream(amt)
+        if amt is None:
+            return b"".join(self._chunks)
+        return next(self._chunks, b"")
+
+    def tell(self):
+        """Bytes downloaded so far, before decompression."""
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    """Sends a session's requests through one httpx.Client(http2=True).
+
+    Returns ordinary requests.Response objects, so callers can't tell the
+    difference. TLS verification and proxies use httpx's defaults.
+    """
+
+    def __init__(self, pool_size=10, on_connect=None):
+        if not HTTP2_AVAILABLE:
+            raise RuntimeError('HTTP/2 needs httpx and h2: pip install "httpx[http2]"')
+        super().__init__()
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self.on_connect = on_connect  # Called with the connect time of each new connection
+        self.num_requests = 0
+        self.num_connections = 0
+        self._lock = threading.Lock()
+        self._connecting = threading.local()
+
+    def _trace(self, event, info):
+        # httpcore trace events, fired on the thread sending the request
+        if event == "connection.connect_tcp.started":
+            self._connecting.started = time.perf_counter()
+            with self._lock:
+                self.num_connections += 1
+        elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self.on_connect is not None:
+                self.on_connect(time.perf_counter() - self._connecting.started)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.num_requests += 1
+
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP}
+        try:
+            http_request = self.client.build_request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=request.body,
+                timeout=_timeout(timeout),
+                extensions={"trace": self._trace},
+            )
+            # Always streamed: requests reads the body itself unless stream=True
+            http_response = self.client.send(http_request, stream=True)
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = http_response.status_code
+        response.reason = http_response.reason_phrase
+        response.headers = CaseInsensitiveDict(http_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = _StreamedBody(http_response, request)
+        response.http_version = http_response.http_version
+        return response
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,237 @@
+"""
+Request Metrics
+===============
+Latency, throughput and error numbers for every outbound request, grouped
+by host and endpoint.
+
+Learn:
+- Latency histograms and percentiles (p50 / p95 / p99)
+- Time to first byte vs total time
+- Exporting metrics as Prometheus text or JSON
+- Compression: bytes on the wire vs bytes after decoding
+
+Timing breakdown per request: connect (DNS + TCP + TLS, only when a new
+connection was opened), time to first byte (response.elapsed) and total.
+"""
+
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import codec
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+RECENT_SAMPLES = 1000  # Latencies kept per endpoint for exact percentiles
+
+_ID_SEGMENT = re.compile(r"^\d+$")
+
+
+def endpoint_of(url):
+    """(host, path) with numeric ids collapsed, e.g. /posts/5 -> /posts/:id."""
+    parts = urlsplit(url)
+    path = "/".join(":id" if _ID_SEGMENT.match(p) else p for p in parts.path.split("/"))
+    return parts.netloc, path or "/"
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = defaultdict(int)    # exception name -> count
+        self.statuses = defaultdict(int)  # status code -> count
+        self.retries = 0
+        self.bytes_in = 0         # As received (compressed)
+        self.bytes_decoded = 0    # After decompression
+        self.bytes_out = 0
+        self.new_connections = 0
+        self.connect_sum = 0.0
+        self.cache = defaultdict(lambda: defaultdict(int))  # layer -> outcome -> count
+        self.buckets = [0] * len(BUCKETS)
+        self.latency_sum = 0.0
+        self.ttfb_sum = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds):
+        self.latency_sum += seconds
+        self.recent.append(seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Metrics:
+    """Thread-safe store of per-endpoint request metrics."""
+
+    def __init__(self):
+        self._stats = defaultdict(EndpointStats)
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def record_request(self, method, url, status, seconds, ttfb=None,
+                       bytes_in=0, bytes_out=0, connect_time=None, bytes_decoded=0):
+        """connect_time is only set when the request had to open a connection."""
+        key = (method,) + endpoint_of(url)
+        with self._lock:
+            stats = self._stats[key]
+            stats.requests += 1
+            stats.statuses[status] += 1
+            stats.bytes_in += bytes_in
+            stats.bytes_decoded += bytes_decoded
+            stats.bytes_out += bytes_out
+            if connect_time is not None:
+                stats.new_connections += 1
+                stats.connect_sum += connect_time
+            stats.ttfb_sum += ttfb or 0.0
+            stats.observe(seconds)
+
+    def record_error(self, method, url, error, seconds):
+        key = (method,) + endpoint_of(url)
+        with self._lock:
+            stats = self._stats[key]
+            stats.requests += 1
+            stats.errors[type(error).__name__] += 1
+            stats.observe(seconds)
+
+    def record_transfer(self, method, url, bytes_in, bytes_decoded):
+        """Body sizes of a streamed response, recorded once it has been read."""
+        with self._lock:
+            stats = self._stats[(method,) + endpoint_of(url)]
+            stats.bytes_in += bytes_in
+            stats.bytes_decoded += bytes_decoded
+
+    def record_retry(self, url, method="GET"):
+        with self._lock:
+            self._stats[(method,) + endpoint_of(url)].retries += 1
+
+    def record_cache(self, url, outcome, layer="disk", method="GET"):
+        """A cache lookup for url.
+
+        layer is "memory" (the in-process TTL cache: hit / stale / miss) or
+        "disk" (the HTTP cache: hit / revalidated / miss).
+        """
+        with self._lock:
+            self._stats[(method,) + endpoint_of(url)].cache[layer][outcome] += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started = time.monotonic()
+
+    # -------------------------------
+    # Export
+    # -------------------------------
+    def as_dict(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        with self._lock:
+            endpoints = []
+            for (method, host, path), s in sorted(self._stats.items()):
+                endpoints.append({
+                    "method": method,
+                    "host": host,
+                    "path": path,
+                    "requests": s.requests,
+                    "requests_per_second": s.requests / elapsed,
+                    "statuses": {str(k): v for k, v in s.statuses.items()},
+                    "errors": dict(s.errors),
+                    "retries": s.retries,
+                    "bytes_in": s.bytes_in,
+                    "bytes_decoded": s.bytes_decoded,
+                    "compression_ratio": s.bytes_decoded / s.bytes_in if s.bytes_in else 1.0,
+                    "bytes_out": s.bytes_out,
+                    "new_connections": s.new_connections,
+                    "latency_p50": s.percentile(0.50),
+                    "latency_p95": s.percentile(0.95),
+                    "latency_p99": s.percentile(0.99),
+                    "latency_avg": s.latency_sum / s.requests if s.requests else 0.0,
+                    "ttfb_avg": s.ttfb_sum / s.requests if s.requests else 0.0,
+                    "connect_avg": s.connect_sum / s.new_connections if s.new_connections else 0.0,
+                    "cache": {layer: dict(counts) for layer, counts in s.cache.items()},
+                    "cache_hit_ratio": {layer: counts["hit"] / sum(counts.values())
+                                        for layer, counts in s.cache.items()},
+                })
+        return {"uptime_seconds": elapsed, "endpoints": endpoints}
+
+    def to_json(self):
+        return codec.dumps(self.as_dict()).decode("utf-8")
+
+    def to_prometheus(self):
+        """Metrics in the Prometheus text exposition format.
+
+        Each family is written as one block: its TYPE line, then every endpoint.
+        """
+        with self._lock:
+            endpoints = [(f'method="{method}",host="{host}",path="{path}"', s)
+                         for (method, host, path), s in sorted(self._stats.items())]
+
+            lines = ["# TYPE api_requests_total counter"]
+            for labels, s in endpoints:
+                for status, count in s.statuses.items():
+                    lines.append(f'api_requests_total{{{labels},status="{status}"}} {count}')
+                for error, count in s.errors.items():
+                    lines.append(f'api_requests_total{{{labels},status="error",error="{error}"}} {count}')
+
+            lines.append("# TYPE api_request_duration_seconds histogram")
+            for labels, s in endpoints:
+                cumulative = 0
+                for bound, count in zip(BUCKETS, s.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'api_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"api_request_duration_seconds_sum{{{labels}}} {s.latency_sum}")
+                lines.append(f"api_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+            lines.append("# TYPE api_retries_total counter")
+            for labels, s in endpoints:
+                lines.append(f"api_retries_total{{{labels}}} {s.retries}")
+
+            lines.append("# TYPE api_new_connections_total counter")
+            for labels, s in endpoints:
+                lines.append(f"api_new_connections_total{{{labels}}} {s.new_connections}")
+
+            lines.append("# TYPE api_bytes_total counter")
+            for labels, s in endpoints:
+                lines.append(f'api_bytes_total{{{labels},direction="in"}} {s.bytes_in}')
+                lines.append(f'api_bytes_total{{{labels},direction="in_decoded"}} {s.bytes_decoded}')
+                lines.append(f'api_bytes_total{{{labels},direction="out"}} {s.bytes_out}')
+
+            lines.append("# TYPE api_cache_total counter")
+            for labels, s in endpoints:
+                for layer, counts in s.cache.items():
+                    for outcome, count in counts.items():
+                        lines.append(f'api_cache_total{{{labels},layer="{layer}",outcome="{outcome}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self):
+        data = self.as_dict()
+
+        print(f"\n{'=' * 114}")
+        print(f"  Request Metrics ({data['uptime_seconds']:.0f}s)")
+        print(f"{'=' * 114}")
+        print(f"  {'Endpoint':<42}{'Reqs':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'Conn ms':>9}{'TTFB ms':>9}{'Retry':>7}{'KB in':>9}{'KB dec':>9}")
+        print(f"  {'-' * 110}")
+
+        for e in data["endpoints"]:
+            name = f"{e['method']} {e['host']}{e['path']}"[:41]
+            print(f"  {name:<42}{e['requests']:>6}{e['latency_p50'] * 1000:>9.1f}"
+                  f"{e['latency_p95'] * 1000:>9.1f}{e['latency_p99'] * 1000:>9.1f}"
+                  f"{e['connect_avg'] * 1000:>9.1f}{e['ttfb_avg'] * 1000:>9.1f}"
+                  f"{e['retries']:>7}{e['bytes_in'] / 1024:>9.1f}{e['bytes_decoded'] / 1024:>9.1f}")
+            problems = {**e["errors"], **{k: v for k, v in e["statuses"].items() if not k.startswith("2")}}
+            if problems:
+                print(f"      errors: {problems}")
+            for layer, counts in e["cache"].items():
+                print(f"      {layer} cache: {counts} (hit ratio {e['cache_hit_ratio'][layer]:.0%})")
+
+
+# Shared by api_client and the retry loops
+metrics = Metrics()
@@ -0,0 +1,158 @@
+"""
+Response Models
+===============
+Small typed objects for the API data we use, instead of nested dicts.
+
+Learn:
+- dataclass(slots=True) objects are much smaller than dicts
+- Checking required fields while copying them (one pass, not two)
+- Dropping fields we never read
+
+Every from_dict() raises ModelError (a ValueError) naming the missing field.
+"""
+
+from dataclasses import asdict, dataclass
+
+
+class ModelError(ValueError):
+    """The API response is missing a field the model needs."""
+
+
+def _require(data, key, where=None):
+    if not isinstance(data, dict) or key not in data:
+        raise ModelError(f"Missing '{key}'" + (f" in {where}" if where else ""))
+    return data[key]
+
+
+@dataclass(slots=True)
+class Ticker:
+    """coinpaprika /v1/tickers item."""
+
+    id: str
+    name: str
+    symbol: str
+    rank: int
+    price: float
+    percent_change_24h: float
+    market_cap: float
+
+    @classmethod
+    def from_dict(cls, data):
+        quotes = _require(data, "quotes")
+        usd = _require(quotes, "USD", "quotes")
+        price = _require(usd, "price", "USD quotes")
+        return cls(
+            id=data.get("id", ""),
+            name=_require(data, "name"),
+            symbol=_require(data, "symbol"),
+            rank=data.get("rank", 0),
+            price=price,
+            percent_change_24h=usd.get("percent_change_24h") or 0.0,
+            market_cap=usd.get("market_cap") or 0.0,
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class CurrentWeather:
+    """Open-Meteo forecast response with current_weather=true."""
+
+    latitude: float
+    longitude: float
+    temperature: float
+    windspeed: float
+    winddirection: float
+    weathercode: int
+    time: str
+
+    @classmethod
+    def from_dict(cls, data):
+        current = _require(data, "current_weather")
+        return cls(
+            latitude=data.get("latitude", 0.0),
+            longitude=data.get("longitude", 0.0),
+            temperature=_require(current, "temperature", "current_weather"),
+            windspeed=_require(current, "windspeed", "current_weather"),
+            winddirection=current.get("winddirection", 0.0),
+            weathercode=current.get("weathercode", 0),
+            time=current.get("time", ""),
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class User:
+    """JSONPlaceholder /users item (address and company flattened)."""
+
+    id: int
+    name: str
+    username: str
+    email: str
+    phone: str
+    website: str
+    city: str
+    company: str
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=_require(data, "id"),
+            name=_require(data, "name"),
+            username=data.get("username", ""),
+            email=_require(data, "email"),
+            phone=data.get("phone", ""),
+            website=data.get("website", ""),
+            city=(data.get("address") or {}).get("city", ""),
+            company=(data.get("company") or {}).get("name", ""),
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class Post:
+    """JSONPlaceholder /posts item."""
+
+    id: int
+    user_id: int
+    title: str
+    body: str
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=_require(data, "id"),
+            user_id=data.get("userId", 0),
+            title=_require(data, "title"),
+            body=data.get("body", ""),
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class Todo:
+    """JSONPlaceholder /todos item."""
+
+    id: int
+    user_id: int
+    title: str
+    completed: bool
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=_require(data, "id"),
+            user_id=data.get("userId", 0),
+            title=_require(data, "title"),
+            completed=_require(data, "completed"),
+        )
+
+    def to_dict(self):
+        return asdict(self)
@@ -0,0 +1,133 @@
+"""
+Pagination
+==========
+Walk a large collection page by page while the next pages download in the
+background.
+
+Learn:
+- Page-number (_page/_limit) and offset (_start/_end) pagination
+- Following Link: <...>; rel="next" headers, or any custom cursor
+- Using X-Total-Count to know where the last page is
+- Prefetching pages on a thread pool with bounded memory
+"""
+
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import api_client
+import codec
+
+PAGE_SIZE = 20
+PREFETCH = 2  # Pages downloaded ahead of the one being read
+
+
+def _page_params(style, page, page_size):
+    if style == "page":
+        return {"_page": page, "_limit": page_size}
+    if style == "offset":
+        start = (page - 1) * page_size
+        return {"_start": start, "_end": start + page_size}
+    raise ValueError(f"Unknown pagination style: {style!r}")
+
+
+def _fetch_page(url, params, items_key):
+    response = api_client.get(url, params=params)
+    response.raise_for_status()
+    data = codec.decode_response(response)
+    items = data[items_key] if items_key else data
+    return response, items
+
+
+def link_next(response, items):
+    """Cursor function that follows the Link header's rel="next" URL."""
+    next_link = response.links.get("next")
+    if not next_link:
+        return None
+    return next_link["url"], None
+
+
+def iter_pages(url, params=None, page_size=PAGE_SIZE, style="page", prefetch=PREFETCH,
+               next_page=None, max_pages=None, items_key=None):
+    """Yield each page of a collection as a list.
+
+    style="page" or "offset" numbers the pages and prefetches `prefetch`
+    pages ahead. style="link" asks for _page/_limit and then follows Link
+    headers. Or pass next_page(response, items) -> (url, params) or None for
+    any other API; those pages are sequential, so only the next one is
+    prefetched.
+    """
+    if style == "link":
+        params = {**(params or {}), **_page_params("page", 1, page_size)}
+        next_page = next_page or link_next
+
+    pool = ThreadPoolExecutor(max_workers=prefetch + 1, thread_name_prefix="prefetch")
+    try:
+        if next_page is not None:
+            yield from _iter_cursor_pages(pool, url, params, next_page, max_pages, items_key)
+        else:
+            yield from _iter_numbered_pages(pool, url, params, page_size, style,
+                                            prefetch, max_pages, items_key)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_numbered_pages(pool, url, params, page_size, style, prefetch, max_pages, items_key):
+    base_params = dict(params or {})
+    pending = deque()
+    next_number = 1
+    last_page = max_pages
+
+    def fill():
+        nonlocal next_number
+        while len(pending) <= prefetch and (last_page is None or next_number <= last_page):
+            page_params = {**base_params, **_page_params(style, next_number, page_size)}
+            pending.append(pool.submit(_fetch_page, url, page_params, items_key))
+            next_number += 1
+
+    fill()
+    while pending:
+        response, items = pending.popleft().result()
+
+        total = response.headers.get("X-Total-Count")
+        if total is not None and total.isdigit():
+            total_pages = math.ceil(int(total) / page_size)
+            last_page = total_pages if max_pages is None else min(max_pages, total_pages)
+            while pending and next_number - 1 > last_page:
+                pending.pop().cancel()
+                next_number -= 1
+
+        if not items:
+            return
+
+        # Queue up more pages before handing this one over
+        if len(items) >= page_size:
+            fill()
+        yield items
+
+        if len(items) < page_size:
+            return
+
+
+def _iter_cursor_pages(pool, url, params, next_page, max_pages, items_key):
+    future = pool.submit(_fetch_page, url, params, items_key)
+    pages = 0
+
+    while future is not None:
+        response, items = future.result()
+        pages += 1
+
+        following = next_page(response, items)
+        if following is None or (max_pages is not None and pages >= max_pages):
+            future = None
+        else:
+            future = pool.submit(_fetch_page, *following, items_key)
+
+        if items:
+            yield items
+
+
+def iter_items(url, params=None, **kwargs):
+    """Yield every item of a paginated collection, one at a time."""
+    for page in iter_pages(url, params, **kwargs):
+        yield from page
@@ -8,7 +8,7 @@ Learn: How to make a simple GET request and view the response.
 We'll use JSONPlaceholder - a free fake API for testing.
 """
 
-import requests
+import api_client
 
 # ---------------------------
 # Exercise 1: Fetch post #5
@@ -18,7 +18,8 @@ import requests
 url = "https://jsonplaceholder.typicode.com/posts/5"
 
 # Step 2: Make a GET request
-response = requests.get(url)
+# (get_json: .json() decodes the body with the fastest JSON library installed)
+response = api_client.get_json(url)
 
 # Step 3: Print the response
 print("=== Exercise 1: Fetch Post #5 ===\n")
@@ -36,7 +37,7 @@ print(response.json())
 url = "https://jsonplaceholder.typicode.com/users"
 
 # Step 2: Make a GET request
-response = requests.get(url)
+response = api_client.get_json(url)
 
 # Step 3: Print the response
 print("\n=== Exercise 2: Fetch All Users ===\n")
@@ -54,7 +55,7 @@ print(response.json())
 url = "https://jsonplaceholder.typicode.com/posts/999"
 
 # Step 2: Make a GET request
-response = requests.get(url)
+response = api_client.get_json(url)
 
 # Step 3: Print the response
 print("\n=== Exercise 3: Fetch Non-Existing Post ===\n")
@@ -9,24 +9,27 @@ Learn:
 - Accessing specific fields from API response
 """
 
-import requests
+import api_client
+from models import Post, User
+from streaming import stream_json_items
 
 print("=== Understanding Status Codes ===\n")
 
 # Example 1: Successful request (200 OK)
 print("--- Example 1: Valid Request ---")
 url_valid = "https://jsonplaceholder.typicode.com/posts/1"
-response = requests.get(url_valid)
+# _embed=comments returns the post with its comments, so Exercise 3 needs no extra request
+post_response = api_client.get_with_embeds(url_valid, embed="comments")
 
 print(f"URL: {url_valid}")
-print(f"Status Code: {response.status_code}")
-print(f"Success? {response.status_code == 200}")
+print(f"Status Code: {post_response.status_code}")
+print(f"Success? {post_response.status_code == 200}")
 
 
 # Example 2: Not Found (404)
 print("\n--- Example 2: Invalid Request (404) ---")
 url_invalid = "https://jsonplaceholder.typicode.com/posts/99999"
-response_404 = requests.get(url_invalid)
+response_404 = api_client.get(url_invalid)
 
 print(f"URL: {url_invalid}")
 print(f"Status Code: {response_404.status_code}")
@@ -36,28 +39,31 @@ print(f"Found? {response_404.status_code == 200}")
 # Example 3: Parsing JSON Data
 print("\n--- Example 3: Parsing JSON ---")
 url = "https://jsonplaceholder.typicode.com/users/1"
-response = requests.get(url)
+response = api_client.get_json(url)
 
 # Convert response to Python dictionary
 data = response.json()
 
+# Turn the dictionary into a User (models.py): a missing field fails here, not later
+user = User.from_dict(data)
+
 # Access specific fields
-print(f"Full Name: {data['name']}")
-print(f"Username: {data['username']}")
-print(f"Email: {data['email']}")
-print(f"City: {data['address']['city']}")
-print(f"Company: {data['company']['name']}")
+print(f"Full Name: {user.name}")
+print(f"Username: {user.username}")
+print(f"Email: {user.email}")
+print(f"City: {user.city}")
+print(f"Company: {user.company}")
 
 
 # Example 4: Working with a list of items
 print("\n--- Example 4: List of Items ---")
 url_list = "https://jsonplaceholder.typicode.com/posts?userId=1"
-response = requests.get(url_list)
-posts = response.json()
 
-print(f"User 1 has {len(posts)} posts:")
-for i, post in enumerate(posts[:3], 1):  # Show first 3
-    print(f"  {i}. {post['title'][:40]}...")
+# Stream the list: only the first 3 posts are parsed, then the connection closes
+print("User 1's first 3 posts:")
+for i, item in enumerate(stream_json_items(url_list, limit=3), 1):
+    post = Post.from_dict(item)
+    print(f"  {i}. {post.title[:40]}...")
 
 
 # --- COMMON STATUS CODES ---
@@ -85,10 +91,10 @@ for code, meaning in status_codes.items():
 # --------------------------------------------------
 print("\n--- Exercise 1: User 5 Phone Number ---")
 url_user5 = "https://jsonplaceholder.typicode.com/users/5"
-response = requests.get(url_user5)
+response = api_client.get_json(url_user5)
 
-data = response.json()
-print(f"User 5 Phone: {data['phone']}")
+user = User.from_dict(response.json())
+print(f"User 5 Phone: {user.phone}")
 
 
 # --------------------------------------------------
@@ -96,9 +102,10 @@ print(f"User 5 Phone: {data['phone']}")
 # --------------------------------------------------
 print("\n--- Exercise 2: Check Resource Exists ---")
 url_check = "https://jsonplaceholder.typicode.com/posts/12345"
-response = requests.get(url_check)
+response = api_client.get_json(url_check)
 
-if response.status_code == 200 and response.json() != {}:
+# json() decodes the body once; found reuses it
+if response.found:
     print("Resource found:")
     print(response.json())
 else:
@@ -109,8 +116,6 @@ else:
 # Exercise 3: Count comments on post ID 1
 # --------------------------------------------------
 print("\n--- Exercise 3: Count Comments on Post 1 ---")
-url_comments = "https://jsonplaceholder.typicode.com/posts/1/comments"
-response = requests.get(url_comments)
-
-comments = response.json()
+# Already embedded in the post from Example 1
+comments = post_response.json()["comments"]
 print(f"Total comments on post 1: {len(comments)}")
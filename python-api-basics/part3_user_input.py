@@ -4,7 +4,12 @@ Part 3: Dynamic Queries with User Input
 Difficulty: Intermediate
 """
 
-import requests
+import sys
+
+import api_client
+from models import ModelError, Post, Todo, User
+from streaming import stream_json_items
+from pagination import iter_items
 
 
 # -------------------------------
@@ -12,13 +17,51 @@ import requests
 # Input validation function
 # -------------------------------
 def get_valid_user_id(prompt):
-    user_id = input(prompt)
+    return check_user_id(input(prompt))
+
+
+def check_user_id(user_id):
     if not user_id.isdigit():
         print("❌ Please enter a valid number!")
         return None
     return user_id
 
 
+# -------------------------------
+# Lookups (no input or printing, so async_dashboard can reuse them)
+# -------------------------------
+def fetch_user(user_id):
+    """The User with this id, or None if there isn't one. Raises ModelError on a malformed body."""
+    response = api_client.get_json(f"https://jsonplaceholder.typicode.com/users/{user_id}")
+    return User.from_dict(response.json()) if response.found else None
+
+
+def iter_posts(user_id):
+    """The user's posts as Post objects, downloaded a page at a time."""
+    params = {"userId": user_id}
+    for item in iter_items("https://jsonplaceholder.typicode.com/posts", params=params, page_size=5):
+        yield Post.from_dict(item)
+
+
+def iter_todos(completed, limit=10):
+    """Up to `limit` todos as Todo objects; completed is "true" or "false"."""
+    params = {"completed": completed}
+    for item in stream_json_items("https://jsonplaceholder.typicode.com/todos", params=params, limit=limit):
+        yield Todo.from_dict(item)
+
+
+def user_lines(user_id, user):
+    if user is None:
+        return [f"\nUser with ID {user_id} not found!"]
+    return [
+        f"\n--- User #{user_id} Info ---",
+        f"Name: {user.name}",
+        f"Email: {user.email}",
+        f"Phone: {user.phone}",
+        f"Website: {user.website}",
+    ]
+
+
 def get_user_info():
     print("=== User Information Lookup ===\n")
 
@@ -26,18 +69,13 @@ def get_user_info():
     if not user_id:
         return
 
-    url = f"https://jsonplaceholder.typicode.com/users/{user_id}"
-    response = requests.get(url)
+    try:
+        user = fetch_user(user_id)
+    except ModelError as e:
+        print(f"\nUnexpected user data: {e}")
+        return
 
-    if response.status_code == 200 and response.json() != {}:
-        data = response.json()
-        print(f"\n--- User #{user_id} Info ---")
-        print(f"Name: {data['name']}")
-        print(f"Email: {data['email']}")
-        print(f"Phone: {data['phone']}")
-        print(f"Website: {data['website']}")
-    else:
-        print(f"\nUser with ID {user_id} not found!")
+    print("\n".join(user_lines(user_id, user)))
 
 
 def search_posts():
@@ -47,17 +85,17 @@ def search_posts():
     if not user_id:
         return
 
-    url = "https://jsonplaceholder.typicode.com/posts"
-    params = {"userId": user_id}
-
-    response = requests.get(url, params=params)
-    posts = response.json()
-
-    if posts:
-        print(f"\n--- Posts by User #{user_id} ---")
-        for i, post in enumerate(posts, 1):
-            print(f"{i}. {post['title']}")
-    else:
+    # Page through the posts; the next pages download while we print
+    count = 0
+    try:
+        for count, post in enumerate(iter_posts(user_id), 1):
+            if count == 1:
+                print(f"\n--- Posts by User #{user_id} ---")
+            print(f"{count}. {post.title}")
+    except ModelError as e:
+        print(f"Unexpected post data: {e}")
+
+    if count == 0:
         print("No posts found for this user.")
 
 
@@ -68,7 +106,7 @@ def get_crypto_price():
     coin_id = input("Enter coin ID: ").lower().strip()
 
     url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
-    response = requests.get(url)
+    response = api_client.get_json(url)
 
     if response.status_code == 200:
         data = response.json()
@@ -105,7 +143,7 @@ def get_weather():
     lat, lon = cities[city]
     url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
 
-    response = requests.get(url)
+    response = api_client.get_json(url)
 
     if response.status_code == 200:
         data = response.json()
@@ -121,28 +159,24 @@ def get_weather():
 # Exercise 2 solution:
 # Search todos by status
 # -------------------------------
+COMPLETED = {"yes": "true", "no": "false"}
+
+
 def search_todos():
     print("\n=== Todo Search ===\n")
 
-    status = input("Show completed todos? (yes/no): ").lower()
-
-    if status == "yes":
-        completed = "true"
-    elif status == "no":
-        completed = "false"
-    else:
+    completed = COMPLETED.get(input("Show completed todos? (yes/no): ").lower())
+    if completed is None:
         print("Invalid choice!")
         return
 
-    url = "https://jsonplaceholder.typicode.com/todos"
-    params = {"completed": completed}
-
-    response = requests.get(url, params=params)
-    todos = response.json()
-
+    # Stream the list and stop after 10 todos instead of downloading all of them
     print(f"\nTodos (completed = {completed})")
-    for todo in todos[:10]:
-        print(f"- {todo['title']}")
+    try:
+        for todo in iter_todos(completed):
+            print(f"- {todo.title}")
+    except ModelError as e:
+        print(f"Unexpected todo data: {e}")
 
 
 def main():
@@ -179,7 +213,12 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--async" in sys.argv[1:]:
+        # Same lookups in the async dashboard: spinner, and Ctrl-C cancels a request
+        from async_dashboard import async_dashboard
+        async_dashboard()
+    else:
+        main()
 
 
 # --- EXERCISES ---
@@ -11,8 +11,20 @@ Learn:
 """
 
 import requests
+import api_client
+import codec
+import asyncio
 import time
 import logging
+from retry import default_policy
+from circuit_breaker import CircuitOpenError
+from singleflight import AsyncSingleFlight
+from rate_limit import get_limiter
+from models import Ticker, ModelError
+from metrics import metrics
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from requests.exceptions import (
     ConnectionError,
     Timeout,
@@ -29,39 +41,129 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 # -------------------------------
 # Exercise 1: Retry logic added
 # -------------------------------
-def safe_api_request(url, timeout=5, retries=3):
+def safe_api_request(url, timeout=5, retries=3, policy=None):
     """Make an API request with proper error handling and retries."""
+    policy = policy or default_policy
+    policy.record_request()
+
     for attempt in range(1, retries + 1):
         try:
             logging.info(f"Requesting: {url} (Attempt {attempt})")
 
-            response = requests.get(url, timeout=timeout)
+            response = api_client.get(url, timeout=timeout)
 
             # Raise exception for bad status codes (4xx, 5xx)
             response.raise_for_status()
 
-            return {"success": True, "data": response.json()}
+            return {"success": True, "data": codec.decode_response(response)}
+
+        except RequestException as e:
+            error = describe_error(e, timeout)
+            last_exception = e
+
+        logging.warning(error)
+
+        if attempt < retries and policy.should_retry(last_exception):
+            metrics.record_retry(url)
+            time.sleep(policy.backoff(attempt, last_exception))
+        else:
+            return {"success": False, "error": error}
+
+
+def describe_error(e, timeout):
+    """Turn a requests exception into a short, readable message."""
+    if isinstance(e, CircuitOpenError):
+        return f"Circuit open: {e.host} is failing, retry in {e.retry_in:.0f}s."
+    if isinstance(e, ConnectionError):
+        return "Connection failed. Check your internet."
+    if isinstance(e, Timeout):
+        return f"Request timed out after {timeout} seconds."
+    if isinstance(e, HTTPError):
+        retry_after = default_policy.retry_after(e)
+        if retry_after is not None:
+            return f"HTTP Error: {e.response.status_code} (server asks to retry in {retry_after:.0f}s)"
+        return f"HTTP Error: {e.response.status_code}"
+    return f"Request failed: {str(e)}"
+
+
+# -------------------------------
+# Async version (asyncio)
+# -------------------------------
+# requests is blocking, so async calls run it on these threads while the
+# event loop keeps the other requests (and their backoff timers) moving.
+ASYNC_MAX_WORKERS = 32
+_async_executor = ThreadPoolExecutor(
+    max_workers=ASYNC_MAX_WORKERS, thread_name_prefix="async-api"
+)
+
+
+# Identical URLs requested at the same time share one attempt/retry loop
+_async_flights = AsyncSingleFlight()
+
+
+def _fetch_json(url, timeout):
+    # The async caller already waited for the rate limiter
+    response = api_client.get(url, timeout=timeout, rate_limit=False)
+    response.raise_for_status()
+    return codec.decode_response(response)
+
 
-        except ConnectionError:
-            error = "Connection failed. Check your internet."
+async def async_safe_api_request(url, timeout=5, retries=3, semaphore=None, policy=None):
+    """Async safe_api_request. Same result dict, but retries wait with asyncio.sleep."""
+    return await _async_flights.do(
+        (url, timeout, retries), _async_request, url, timeout, retries, semaphore, policy
+    )
 
-        except Timeout:
-            error = f"Request timed out after {timeout} seconds."
 
-        except HTTPError as e:
-            error = f"HTTP Error: {e.response.status_code}"
+async def _async_request(url, timeout, retries, semaphore, policy):
+    loop = asyncio.get_running_loop()
+    limiter = get_limiter(urlsplit(url).hostname)
+    policy = policy or default_policy
+    policy.record_request()
+
+    for attempt in range(1, retries + 1):
+        try:
+            logging.info(f"Requesting: {url} (Attempt {attempt})")
+
+            call = partial(_fetch_json, url, timeout)
+            # Only the network call takes a concurrency slot, not the backoff
+            if semaphore is None:
+                data = await _limited_call(loop, limiter, call)
+            else:
+                async with semaphore:
+                    data = await _limited_call(loop, limiter, call)
+
+            return {"success": True, "data": data}
 
         except RequestException as e:
-            error = f"Request failed: {str(e)}"
+            error = describe_error(e, timeout)
+            last_exception = e
 
         logging.warning(error)
 
-        if attempt < retries:
-            time.sleep(1)
+        if attempt < retries and policy.should_retry(last_exception):
+            metrics.record_retry(url)
+            await asyncio.sleep(policy.backoff(attempt, last_exception))
         else:
             return {"success": False, "error": error}
 
 
+async def _limited_call(loop, limiter, call):
+    if limiter is not None:
+        await limiter.acquire_async()
+    return await loop.run_in_executor(_async_executor, call)
+
+
+async def async_fetch_all(urls, limit=api_client.POOL_SIZE, timeout=5, retries=3):
+    """Fetch many URLs concurrently, at most `limit` in flight. Results keep input order."""
+    semaphore = asyncio.Semaphore(limit)
+    tasks = [
+        async_safe_api_request(url, timeout=timeout, retries=retries, semaphore=semaphore)
+        for url in urls
+    ]
+    return await asyncio.gather(*tasks)
+
+
 def demo_error_handling():
     """Demonstrate different error scenarios."""
     print("=== Error Handling Demo ===\n")
@@ -104,12 +206,10 @@ def demo_error_handling():
 # -------------------------------
 def validate_crypto_response(data):
     """Validate crypto API response structure."""
-    if "quotes" not in data:
-        return False, "Missing 'quotes'"
-    if "USD" not in data["quotes"]:
-        return False, "Missing 'USD' in quotes"
-    if "price" not in data["quotes"]["USD"]:
-        return False, "Missing 'price' in USD quotes"
+    try:
+        Ticker.from_dict(data)
+    except ModelError as e:
+        return False, str(e)
     return True, None
 
 
@@ -127,16 +227,16 @@ def fetch_crypto_safely():
     result = safe_api_request(url)
 
     if result["success"]:
-        data = result["data"]
-
-        valid, error = validate_crypto_response(data)
-        if not valid:
-            print(f"Invalid crypto data: {error}")
+        # Validate and convert in one step
+        try:
+            ticker = Ticker.from_dict(result["data"])
+        except ModelError as e:
+            print(f"Invalid crypto data: {e}")
             return
 
-        print(f"\n{data['name']} ({data['symbol']})")
-        print(f"Price: ${data['quotes']['USD']['price']:,.2f}")
-        print(f"24h Change: {data['quotes']['USD']['percent_change_24h']:+.2f}%")
+        print(f"\n{ticker.name} ({ticker.symbol})")
+        print(f"Price: ${ticker.price:,.2f}")
+        print(f"24h Change: {ticker.percent_change_24h:+.2f}%")
     else:
         print(f"\nError: {result['error']}")
         print("Tip: Try 'btc-bitcoin' or 'eth-ethereum'")
@@ -150,9 +250,9 @@ def validate_json_response():
 
     try:
         logging.info(f"Requesting: {url}")
-        response = requests.get(url, timeout=5)
+        response = api_client.get(url, timeout=5)
         response.raise_for_status()
-        data = response.json()
+        data = codec.decode_response(response)
 
         # Validate expected fields exist
         required_fields = ["name", "email", "phone"]
@@ -173,14 +273,36 @@ def validate_json_response():
         print(f"Error: {e}")
 
 
+def demo_async_batch():
+    """Fetch a batch of posts concurrently with the async helpers."""
+    print("=== Async Batch Demo ===\n")
+
+    urls = [f"https://jsonplaceholder.typicode.com/posts/{i}" for i in range(1, 21)]
+    urls.append("https://jsonplaceholder.typicode.com/posts/99999")
+
+    start = time.perf_counter()
+    results = asyncio.run(async_fetch_all(urls, limit=10))
+    elapsed = time.perf_counter() - start
+
+    ok = sum(1 for r in results if r["success"])
+    print(f"Fetched {ok}/{len(urls)} URLs in {elapsed:.2f}s")
+    for url, result in zip(urls, results):
+        if not result["success"]:
+            print(f"  Failed: {url} -> {result['error']}")
+
+
 def main():
     """Run all demos."""
     demo_error_handling()
     print("\n" + "=" * 40 + "\n")
+    demo_async_batch()
+    print("\n" + "=" * 40 + "\n")
     validate_json_response()
     print("\n" + "=" * 40 + "\n")
     fetch_crypto_safely()
 
+    metrics.print_summary()
+
 
 if __name__ == "__main__":
     main()
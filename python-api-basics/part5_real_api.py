@@ -5,9 +5,19 @@ Difficulty: Advanced
 """
 
 import requests
+import api_client
+import codec
+from cache import response_cache, make_key, MISSING, get_stale_while_revalidate
+from singleflight import SingleFlight
+from models import CurrentWeather, Ticker, ModelError
+from scheduler import RefreshScheduler, Snapshot
+from metrics import metrics
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+import logging
 import os
+import threading
+import time
 
 # -------------------------------
 # Exercise 1: Added more cities
@@ -36,130 +46,573 @@ CRYPTO_IDS = {
     "ripple": "xrp-xrp",
 }
 
+# API base URLs. Override with environment variables, e.g. to point the
+# benchmarks at a local mock server.
+OPEN_METEO_API = os.environ.get("OPEN_METEO_API", "https://api.open-meteo.com")
+COINPAPRIKA_API = os.environ.get("COINPAPRIKA_API", "https://api.coinpaprika.com")
+JSONPLACEHOLDER_API = os.environ.get("JSONPLACEHOLDER_API", "https://jsonplaceholder.typicode.com")
+
+# Max parallel ticker requests in concurrent compare mode
+# (kept within api_client.POOL_SIZE so every worker gets a pooled connection)
+MAX_WORKERS = 8
+
+# How long cached responses stay fresh (seconds).
+# Open-Meteo current_weather updates every 15 min, coinpaprika tickers every few.
+WEATHER_CACHE_TTL = 300
+TICKER_CACHE_TTL = 60
+
+# After that, how much longer stale data may still be served while it refreshes
+# (and while the upstream is failing). Past this it is dropped.
+WEATHER_STALE_TTL = 3600
+TICKER_STALE_TTL = 600
+
+# Cities per batched Open-Meteo request in get_weather_many
+WEATHER_BATCH_SIZE = 50
+
+# Bulk ticker mode: the whole /v1/tickers list is fetched at most this often
+TICKER_LIST_TTL = 60
+# ...and after a failed download, not retried for this long
+TICKER_LIST_RETRY = 15
+# compare_cryptos switches to bulk mode from this many coins
+BULK_THRESHOLD = 10
+
+# Identical lookups running at the same time share one request
+flights = SingleFlight()
+
+
+def _fetch_json(url, params=None, use_cache=True):
+    # use_cache=False skips the disk cache too, not just the in-memory one
+    response = api_client.get(url, params=params, timeout=10, use_disk_cache=use_cache)
+    response.raise_for_status()
+    return codec.decode_response(response)
+
+
+def _fetch_model(model, url, params=None, use_cache=True):
+    return model.from_dict(_fetch_json(url, params, use_cache))
+
 
 # -------------------------------
 # WEATHER
 # -------------------------------
-def get_weather(city_name):
-    city_lower = city_name.lower().strip()
-
-    if city_lower not in CITIES:
-        print(f"\nCity '{city_name}' not found.")
-        return None
+WEATHER_URL = f"{OPEN_METEO_API}/v1/forecast"
 
-    lat, lon = CITIES[city_lower]
 
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
+def _weather_params(lat, lon):
+    return {
         "latitude": lat,
         "longitude": lon,
         "current_weather": True,
         "timezone": "auto"
     }
 
+
+def get_weather(city_name, use_cache=True):
+    city_lower = city_name.lower().strip()
+
+    if city_lower not in CITIES:
+        print(f"\nCity '{city_name}' not found.")
+        return None
+
+    if use_cache:
+        cached = response_cache.get(make_key(WEATHER_URL, _weather_params(*CITIES[city_lower])))
+        if cached is not MISSING:
+            metrics.record_cache(WEATHER_URL, "hit", layer="memory")
+            return cached
+        metrics.record_cache(WEATHER_URL, "miss", layer="memory")
+
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        return _fetch_weather(city_lower, use_cache)
+    except (requests.RequestException, ModelError) as e:
+        print(f"Error fetching weather: {e}")
+        return None
+
+
+def _fetch_weather(city_lower, use_cache=True):
+    """Download one known city's weather and cache it in memory."""
+    params = _weather_params(*CITIES[city_lower])
+    key = make_key(WEATHER_URL, params)
+    data = flights.do(key, _fetch_model, CurrentWeather, WEATHER_URL, params, use_cache)
+    response_cache.set(key, data, ttl=WEATHER_CACHE_TTL, stale_ttl=WEATHER_STALE_TTL)
+    return data
+
+
+def get_weather_served(city_name):
+    """Weather as cache.Served(value, fresh, age), serving stale data while it refreshes.
+
+    Only waits on the network when nothing is cached. Returns None on failure.
+    """
+    city_lower = city_name.lower().strip()
+    if city_lower not in CITIES:
+        print(f"\nCity '{city_name}' not found.")
+        return None
+
+    params = _weather_params(*CITIES[city_lower])
+    key = make_key(WEATHER_URL, params)
+
+    def fetch():
+        return flights.do(key, _fetch_model, CurrentWeather, WEATHER_URL, params)
+
+    try:
+        return _get_served(WEATHER_URL, key, fetch, WEATHER_CACHE_TTL, WEATHER_STALE_TTL)
+    except (requests.RequestException, ModelError) as e:
         print(f"Error fetching weather: {e}")
         return None
 
 
 def display_weather(city_name):
-    data = get_weather(city_name)
-    if not data:
+    weather, age = _from_snapshot(("weather", city_name.lower().strip()),
+                                  WEATHER_CACHE_TTL, WEATHER_STALE_TTL)
+    note = ""
+    if weather is not None and age >= WEATHER_CACHE_TTL:
+        note = f" (updated {age / 60:.0f} min ago)"
+    elif weather is None:
+        served = get_weather_served(city_name)
+        if not served:
+            return
+        weather = served.value
+        if not served.fresh:
+            note = f" (cached {served.age / 60:.0f} min ago, refreshing)"
+
+    if not weather:
         return
 
-    current = data["current_weather"]
-
     print(f"\n{'=' * 40}")
-    print(f"  Weather in {city_name.title()}")
+    print(f"  Weather in {city_name.title()}{note}")
     print(f"{'=' * 40}")
-    print(f"  Temperature: {current['temperature']}°C")
-    print(f"  Wind Speed: {current['windspeed']} km/h")
+    print(f"  Temperature: {weather.temperature}°C")
+    print(f"  Wind Speed: {weather.windspeed} km/h")
     print(f"{'=' * 40}")
 
 
+# ------------------------------------------------
+# Many cities in one request
+# ------------------------------------------------
+def get_weather_many(cities, use_cache=True, quiet=False):
+    """Weather for several cities using comma-separated Open-Meteo coordinates.
+
+    Returns {city: CurrentWeather or None}. A failed batch falls back to one request per city.
+    quiet=True logs errors instead of printing them (for background threads).
+    """
+    results = {}
+    to_fetch = []
+    order = []
+
+    for city in cities:
+        city_lower = city.lower().strip()
+        order.append(city_lower)
+        if city_lower not in CITIES:
+            results[city_lower] = None
+            continue
+
+        if not use_cache:
+            to_fetch.append(city_lower)
+            continue
+
+        cached = response_cache.get(make_key(WEATHER_URL, _weather_params(*CITIES[city_lower])))
+        if cached is MISSING:
+            metrics.record_cache(WEATHER_URL, "miss", layer="memory")
+            to_fetch.append(city_lower)
+        else:
+            metrics.record_cache(WEATHER_URL, "hit", layer="memory")
+            results[city_lower] = cached
+
+    for start in range(0, len(to_fetch), WEATHER_BATCH_SIZE):
+        batch = to_fetch[start:start + WEATHER_BATCH_SIZE]
+        try:
+            results.update(_fetch_weather_batch(batch, use_cache))
+        except (requests.RequestException, ValueError):
+            for city in batch:
+                try:
+                    results[city] = _fetch_weather(city, use_cache)
+                except (requests.RequestException, ModelError) as e:
+                    if quiet:
+                        logging.info(f"Error fetching weather for {city}: {e}")
+                    else:
+                        print(f"Error fetching weather: {e}")
+                    results[city] = None
+
+    return {city: results[city] for city in order}
+
+
+def _fetch_weather_batch(batch, use_cache=True):
+    coords = [CITIES[city] for city in batch]
+    params = {
+        "latitude": ",".join(str(lat) for lat, _ in coords),
+        "longitude": ",".join(str(lon) for _, lon in coords),
+        "current_weather": True,
+        "timezone": "auto"
+    }
+
+    data = _fetch_json(WEATHER_URL, params, use_cache)
+    # One location comes back as an object, several as a list
+    if isinstance(data, dict):
+        data = [data]
+    if len(data) != len(batch):
+        raise ValueError(f"Expected {len(batch)} locations, got {len(data)}")
+
+    # ModelError is a ValueError, so an incomplete location also triggers the fallback
+    results = {city: CurrentWeather.from_dict(location) for city, location in zip(batch, data)}
+    for city, weather in results.items():
+        key = make_key(WEATHER_URL, _weather_params(*CITIES[city]))
+        response_cache.set(key, weather, ttl=WEATHER_CACHE_TTL, stale_ttl=WEATHER_STALE_TTL)
+    return results
+
+
+def display_weather_board(cities=None):
+    cities = cities or list(CITIES)
+
+    # Use what the background refresh already has, fetch only the rest
+    results = {}
+    for city in cities:
+        city_lower = city.lower().strip()
+        results[city_lower], _ = _from_snapshot(("weather", city_lower),
+                                                WEATHER_CACHE_TTL, WEATHER_STALE_TTL)
+    missing = [city for city, weather in results.items() if weather is None]
+    if missing:
+        results.update(get_weather_many(missing))
+
+    print("\n".join(weather_board_lines(results)))
+    return results
+
+
+def weather_board_lines(results):
+    """The weather board table for {city: CurrentWeather or None}, as lines."""
+    lines = [
+        f"\n{'=' * 50}",
+        f"  Weather Board",
+        f"{'=' * 50}",
+        f"  {'City':<15}{'Temperature':<15}{'Wind Speed'}",
+        f"  {'-' * 45}",
+    ]
+    for city, weather in results.items():
+        if weather:
+            lines.append(f"  {city.title():<15}{str(weather.temperature) + '°C':<15}{weather.windspeed} km/h")
+        else:
+            lines.append(f"  {city.title():<15}{'n/a':<15}n/a")
+    return lines
+
+
 # -------------------------------
 # CRYPTO
 # -------------------------------
-def get_crypto_price(coin_name):
+def get_crypto_price(coin_name, use_cache=True, bulk=False):
+    if bulk:
+        return ticker_index.lookup(coin_name)
+
     coin_lower = coin_name.lower().strip()
     coin_id = CRYPTO_IDS.get(coin_lower, coin_lower)
 
-    url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
+    url = f"{COINPAPRIKA_API}/v1/tickers/{coin_id}"
+
+    if use_cache:
+        cached = response_cache.get(url)
+        if cached is not MISSING:
+            metrics.record_cache(url, "hit", layer="memory")
+            return cached
+        metrics.record_cache(url, "miss", layer="memory")
 
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException:
+        data = flights.do(url, _fetch_model, Ticker, url, None, use_cache)
+    except (requests.RequestException, ModelError):
         return None
 
+    response_cache.set(url, data, ttl=TICKER_CACHE_TTL, stale_ttl=TICKER_STALE_TTL)
+    return data
+
+
+def get_crypto_price_served(coin_name):
+    """Ticker as cache.Served(value, fresh, age), serving stale data while it refreshes.
+
+    Only waits on the network when nothing is cached. Returns None on failure.
+    """
+    coin_lower = coin_name.lower().strip()
+    coin_id = CRYPTO_IDS.get(coin_lower, coin_lower)
+    url = f"{COINPAPRIKA_API}/v1/tickers/{coin_id}"
+
+    def fetch():
+        return flights.do(url, _fetch_model, Ticker, url)
+
+    try:
+        return _get_served(url, url, fetch, TICKER_CACHE_TTL, TICKER_STALE_TTL)
+    except (requests.RequestException, ModelError):
+        return None
 
-def display_crypto(coin_name):
-    data = get_crypto_price(coin_name)
 
-    if not data:
+def _get_served(url, key, fetch, ttl, stale_ttl):
+    """get_stale_while_revalidate on the response cache, counting the lookup for url."""
+    missed = []
+
+    def on_miss():
+        missed.append(True)
+        metrics.record_cache(url, "miss", layer="memory")
+
+    served = get_stale_while_revalidate(response_cache, key, fetch, ttl, stale_ttl, on_miss)
+    if not missed:
+        metrics.record_cache(url, "hit" if served.fresh else "stale", layer="memory")
+    return served
+
+
+def display_crypto(coin_name, bulk=False):
+    ticker, age = _from_snapshot(("crypto", coin_name.lower().strip()),
+                                 TICKER_CACHE_TTL, TICKER_STALE_TTL)
+    note = ""
+    if ticker is not None and age >= TICKER_CACHE_TTL:
+        note = f" (updated {age:.0f}s ago)"
+    elif ticker is None:
+        if bulk:
+            ticker = get_crypto_price(coin_name, bulk=True)
+        else:
+            served = get_crypto_price_served(coin_name)
+            ticker = served.value if served else None
+            if served and not served.fresh:
+                note = f" (cached {served.age:.0f}s ago, refreshing)"
+
+    if not ticker:
         print("Coin not found.")
         return
 
-    usd = data["quotes"]["USD"]
-
     print(f"\n{'=' * 40}")
-    print(f"  {data['name']} ({data['symbol']})")
+    print(f"  {ticker.name} ({ticker.symbol}){note}")
     print(f"{'=' * 40}")
-    print(f"  Price: ${usd['price']:,.2f}")
-    print(f"  24h Change: {usd['percent_change_24h']:+.2f}%")
+    print(f"  Price: ${ticker.price:,.2f}")
+    print(f"  24h Change: {ticker.percent_change_24h:+.2f}%")
     print(f"{'=' * 40}")
 
 
+# -------------------------------
+# Bulk tickers (one request for all coins)
+# -------------------------------
+class TickerIndex:
+    """All coinpaprika tickers from /v1/tickers, indexed by id, symbol and name."""
+
+    url = f"{COINPAPRIKA_API}/v1/tickers"
+
+    def __init__(self, refresh_interval=TICKER_LIST_TTL, retry_after=TICKER_LIST_RETRY):
+        self.refresh_interval = refresh_interval
+        self.retry_after = retry_after
+        self.loaded_at = None
+        self.failed_at = None
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def is_stale(self):
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh_interval
+
+    def needs_refresh(self):
+        """Stale, and not backing off after a failed download."""
+        if not self.is_stale():
+            return False
+        return self.failed_at is None or time.monotonic() - self.failed_at >= self.retry_after
+
+    def refresh(self, use_cache=True):
+        """Download the full ticker list and rebuild the index."""
+        items = flights.do(self.url, _fetch_json, self.url, None, use_cache)
+
+        by_key = {}
+        # Tickers come sorted by rank, so on a shared symbol/name the top coin wins
+        for item in items:
+            try:
+                ticker = Ticker.from_dict(item)
+            except ModelError:
+                continue
+            by_key[ticker.id] = ticker
+            by_key.setdefault(ticker.symbol.lower(), ticker)
+            by_key.setdefault(ticker.name.lower(), ticker)
+
+        for friendly, coin_id in CRYPTO_IDS.items():
+            if coin_id in by_key:
+                by_key[friendly] = by_key[coin_id]
+
+        with self._lock:
+            self._by_key = by_key
+            self.loaded_at = time.monotonic()
+            self.failed_at = None
+
+    def _ensure_loaded(self):
+        """Refresh if needed; False when there is no list to answer from."""
+        if self.needs_refresh():
+            try:
+                self.refresh()
+            except (requests.RequestException, ValueError):
+                # Keep serving the previous list (if any) and don't retry on every lookup
+                self.failed_at = time.monotonic()
+        return self.loaded_at is not None
+
+    def _get(self, coin_name):
+        key = coin_name.lower().strip()
+        with self._lock:
+            return self._by_key.get(key) or self._by_key.get(CRYPTO_IDS.get(key, key))
+
+    def lookup(self, coin_name):
+        """Ticker for a coin id, symbol or name, or None. Refreshes when stale."""
+        if not self._ensure_loaded():
+            return None
+        return self._get(coin_name)
+
+    def lookup_many(self, coins, fresh=False):
+        """Tickers for several coins (None where unknown), refreshing at most once.
+
+        fresh=True downloads the list now, skipping the disk cache, and gives
+        all None if that fails rather than answering from an older list.
+        """
+        if fresh:
+            try:
+                self.refresh(use_cache=False)
+            except (requests.RequestException, ValueError):
+                self.failed_at = time.monotonic()
+                return [None] * len(coins)
+        elif not self._ensure_loaded():
+            return [None] * len(coins)
+        return [self._get(coin) for coin in coins]
+
+
+ticker_index = TickerIndex()
+
+
 # ------------------------------------------------
 # Exercise 2: Compare multiple crypto prices
 # ------------------------------------------------
-def compare_cryptos(coins):
-    print(f"\n{'=' * 55}")
-    print(f"  Crypto Price Comparison")
-    print(f"{'=' * 55}")
-    print(f"  {'Name':<15}{'Price (USD)':<15}{'24h Change'}")
-    print(f"  {'-' * 50}")
+def fetch_cryptos(coins, max_workers=MAX_WORKERS, use_cache=True):
+    """Fetch several tickers at once, results in the same order as coins."""
+    if not coins:
+        return []
+
+    workers = max(1, min(max_workers, len(coins)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda coin: get_crypto_price(coin, use_cache=use_cache), coins))
+
+
+def compare_cryptos(coins, concurrent=False, max_workers=MAX_WORKERS, bulk=False):
+    if bulk:
+        all_data = ticker_index.lookup_many(coins)
+    elif concurrent:
+        all_data = fetch_cryptos(coins, max_workers)
+    else:
+        all_data = [get_crypto_price(coin) for coin in coins]
+
+    print("\n".join(crypto_table_lines(all_data)))
 
     results = []
 
-    for coin in coins:
-        data = get_crypto_price(coin)
-        if data:
-            usd = data["quotes"]["USD"]
-            print(f"  {data['name']:<15}${usd['price']:<14,.2f}{usd['percent_change_24h']:+.2f}%")
+    for ticker in all_data:
+        if ticker:
             results.append({
-                "name": data["name"],
-                "price": usd["price"],
-                "change_24h": usd["percent_change_24h"]
+                "name": ticker.name,
+                "price": ticker.price,
+                "change_24h": ticker.percent_change_24h
             })
 
     return results
 
 
+def crypto_table_lines(tickers):
+    """The price comparison table for a list of Tickers (None skipped), as lines."""
+    lines = [
+        f"\n{'=' * 55}",
+        f"  Crypto Price Comparison",
+        f"{'=' * 55}",
+        f"  {'Name':<15}{'Price (USD)':<15}{'24h Change'}",
+        f"  {'-' * 50}",
+    ]
+    for ticker in tickers:
+        if ticker:
+            lines.append(f"  {ticker.name:<15}${ticker.price:<14,.2f}{ticker.percent_change_24h:+.2f}%")
+    return lines
+
+
+# -------------------------------
+# Background refresh
+# -------------------------------
+WEATHER_REFRESH_INTERVAL = WEATHER_CACHE_TTL
+CRYPTO_REFRESH_INTERVAL = TICKER_CACHE_TTL
+
+# Latest data from the background refresh; the dashboard reads it instantly
+snapshot = Snapshot()
+_scheduler = None
+
+
+def _from_snapshot(key, ttl, stale_ttl):
+    """(value, age) from the snapshot, or (None, None) if missing or older than ttl + stale_ttl.
+
+    A stuck background refresh must not keep showing old data forever.
+    """
+    age = snapshot.age(key)
+    if age is None or age >= ttl + stale_ttl:
+        return None, None
+    return snapshot.get(key), age
+
+
+def _refresh_weather(cities):
+    for city, weather in get_weather_many(cities, use_cache=False, quiet=True).items():
+        if weather:
+            snapshot.publish(("weather", city), weather)
+
+
+def _refresh_crypto(coins):
+    if len(coins) >= BULK_THRESHOLD:
+        tickers = ticker_index.lookup_many(coins)
+    else:
+        tickers = fetch_cryptos(coins, use_cache=False)
+
+    for coin, ticker in zip(coins, tickers):
+        if ticker:
+            snapshot.publish(("crypto", coin.lower().strip()), ticker)
+
+
+def start_background_refresh(cities=None, coins=None,
+                             weather_interval=WEATHER_REFRESH_INTERVAL,
+                             crypto_interval=CRYPTO_REFRESH_INTERVAL):
+    """Keep the snapshot fresh for these cities and coins in the background."""
+    global _scheduler
+
+    if _scheduler is not None:
+        return _scheduler
+
+    cities = cities or list(CITIES)
+    coins = coins or list(CRYPTO_IDS)
+
+    _scheduler = RefreshScheduler()
+    _scheduler.add_job("weather", _refresh_weather, weather_interval, cities)
+
+    if len(coins) >= BULK_THRESHOLD:
+        _scheduler.add_job("crypto", _refresh_crypto, crypto_interval, coins)
+    else:
+        # One job per coin, so the scheduler spreads them over the interval
+        for coin in coins:
+            _scheduler.add_job(f"crypto:{coin}", _refresh_crypto, crypto_interval, [coin])
+
+    _scheduler.start()
+    return _scheduler
+
+
+def stop_background_refresh():
+    global _scheduler
+
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
+
+
 # ------------------------------------------------
 # Exercise 3: POST request example
 # ------------------------------------------------
 def create_post():
-    url = "https://jsonplaceholder.typicode.com/posts"
+    url = f"{JSONPLACEHOLDER_API}/posts"
     payload = {"title": "My Post", "body": "Content", "userId": 1}
 
-    response = requests.post(url, json=payload)
+    response = api_client.post(url, json=payload)
+    data = codec.decode_response(response)
     print("\nPost Created!")
-    print(response.json())
-    return response.json()
+    print(data)
+    return data
 
 
 # ------------------------------------------------
 # Exercise 4: Save results to JSON file
 # ------------------------------------------------
-def save_to_file(data, filename="results.json"):
-    with open(filename, "w") as f:
-        json.dump(data, f, indent=2)
+def save_to_file(data, filename="results.json", compact=False):
+    with open(filename, "wb") as f:
+        f.write(codec.dumps(data, indent=not compact))
     print(f"\nData saved to {filename}")
 
 
@@ -177,9 +630,9 @@ def get_weather_with_api_key(city):
     params = {"q": city, "appid": api_key, "units": "metric"}
 
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = api_client.get(url, params=params, timeout=10)
         response.raise_for_status()
-        return response.json()
+        return codec.decode_response(response)
     except requests.RequestException as e:
         print(f"API Error: {e}")
         return None
@@ -188,20 +641,25 @@ def get_weather_with_api_key(city):
 # -------------------------------
 # DASHBOARD
 # -------------------------------
-def dashboard():
+def dashboard(background=True):
     print("\n" + "=" * 50)
     print("   Real-World API Dashboard")
     print("=" * 50)
 
+    if background:
+        start_background_refresh()
+
     while True:
         print("\nOptions:")
         print("  1. Check Weather")
         print("  2. Check Crypto Price")
         print("  3. Compare Cryptos")
         print("  4. Create Sample POST")
-        print("  5. Exit")
+        print("  5. Weather for All Cities")
+        print("  6. Show Request Metrics")
+        print("  7. Exit")
 
-        choice = input("\nSelect (1-5): ").strip()
+        choice = input("\nSelect (1-7): ").strip()
 
         if choice == "1":
             print(f"Available: {', '.join(CITIES.keys())}")
@@ -215,7 +673,8 @@ def dashboard():
 
         elif choice == "3":
             coins = input("Enter coins (comma separated): ").split(",")
-            results = compare_cryptos([c.strip() for c in coins])
+            coins = [c.strip() for c in coins]
+            results = compare_cryptos(coins, concurrent=True, bulk=len(coins) >= BULK_THRESHOLD)
             save = input("Save results to file? (y/n): ").lower()
             if save == "y":
                 save_to_file(results)
@@ -225,6 +684,13 @@ def dashboard():
             save_to_file(post_data, "post_result.json")
 
         elif choice == "5":
+            display_weather_board()
+
+        elif choice == "6":
+            metrics.print_summary()
+
+        elif choice == "7":
+            stop_background_refresh()
             print("Goodbye! Happy coding!")
             break
 
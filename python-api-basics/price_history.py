@@ -0,0 +1,227 @@
+"""
+Crypto Price History
+====================
+Polls tickers on a schedule and keeps every sample in columnar NumPy arrays,
+stored as memory-mapped files so months of history stay on disk, not in RAM.
+
+Learn:
+- Columnar storage: one array per field (timestamp, price, 24h change)
+- np.memmap / .npy files that grow as samples are appended
+- Vectorized analytics: rolling mean, volatility, min/max, correlation
+
+Needs NumPy:
+    pip install numpy
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "python-api-basics", "price_history"
+)
+POLL_INTERVAL = 60     # Seconds between polls
+INITIAL_CAPACITY = 1024
+
+COLUMNS = {
+    "timestamp": np.float64,
+    "price": np.float64,
+    "change_24h": np.float32,
+}
+
+
+class CoinSeries:
+    """Append-only columns for one coin, each in its own .npy memmap."""
+
+    def __init__(self, directory, coin_id):
+        self.directory = directory
+        self.coin_id = coin_id
+        self._meta_path = os.path.join(directory, f"{coin_id}.json")
+        self.length = 0
+        self._columns = {}
+
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self.length = json.load(f)["length"]
+            for name in COLUMNS:
+                self._columns[name] = np.load(self._path(name), mmap_mode="r+")
+        else:
+            self._allocate(INITIAL_CAPACITY)
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{self.coin_id}.{name}.npy")
+
+    @property
+    def capacity(self):
+        return len(self._columns["timestamp"])
+
+    def _allocate(self, capacity):
+        """Create (or grow) every column file to hold `capacity` samples."""
+        for name, dtype in COLUMNS.items():
+            old = self._columns.pop(name, None)
+            tmp_path = self._path(name) + ".tmp"
+            new = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(capacity,))
+            if old is not None:
+                new[:self.length] = old[:self.length]
+            new.flush()
+            # Release both mappings before swapping the files (required on Windows)
+            del old, new
+            os.replace(tmp_path, self._path(name))
+            self._columns[name] = np.load(self._path(name), mmap_mode="r+")
+
+    def append(self, timestamp, price, change_24h):
+        if self.length == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        i = self.length
+        self._columns["timestamp"][i] = timestamp
+        self._columns["price"][i] = price
+        self._columns["change_24h"][i] = change_24h
+        self.length += 1
+
+    def flush(self):
+        for column in self._columns.values():
+            column.flush()
+        with open(self._meta_path, "w") as f:
+            json.dump({"length": self.length}, f)
+
+    def column(self, name, since=None):
+        """View of a column's samples, optionally only those after `since`."""
+        values = self._columns[name][:self.length]
+        if since is None:
+            return values
+        start = np.searchsorted(self._columns["timestamp"][:self.length], since)
+        return values[start:]
+
+
+class PriceHistory:
+    """Price history for many coins, with polling and analytics."""
+
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._series = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def series(self, coin_id):
+        with self._lock:
+            series = self._series.get(coin_id)
+            if series is None:
+                series = CoinSeries(self.directory, coin_id)
+                self._series[coin_id] = series
+        return series
+
+    # -------------------------------
+    # Recording
+    # -------------------------------
+    def record(self, tickers, timestamp=None):
+        """Append one sample per Ticker and write it to disk."""
+        timestamp = time.time() if timestamp is None else timestamp
+        for ticker in tickers:
+            if ticker is None:
+                continue
+            series = self.series(ticker.id)
+            with self._lock:
+                series.append(timestamp, ticker.price, ticker.percent_change_24h)
+                series.flush()
+
+    def poll_once(self, coins):
+        """Fetch the coins now (skipping the in-memory and disk caches) and record them."""
+        from part5_real_api import BULK_THRESHOLD, fetch_cryptos, ticker_index
+
+        if len(coins) >= BULK_THRESHOLD:
+            tickers = ticker_index.lookup_many(coins, fresh=True)
+        else:
+            tickers = fetch_cryptos(coins, use_cache=False)
+        self.record(tickers)
+        return tickers
+
+    def start_polling(self, coins, interval=POLL_INTERVAL):
+        """Poll the coins every `interval` seconds on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.poll_once(coins)
+                except Exception as e:
+                    # One bad poll (e.g. a full disk) must not end the polling thread
+                    logging.warning(f"Price history poll failed: {e}")
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name="price-history", daemon=True)
+        self._thread.start()
+
+    def stop_polling(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # -------------------------------
+    # Analytics
+    # -------------------------------
+    def prices(self, coin_id, since=None):
+        series = self.series(coin_id)
+        # The poller swaps the column files while growing a series; don't read mid-swap
+        with self._lock:
+            return series.column("timestamp", since), series.column("price", since)
+
+    def rolling_mean(self, coin_id, window, since=None):
+        """Mean price over each run of `window` samples."""
+        _, prices = self.prices(coin_id, since)
+        if len(prices) < window:
+            return np.empty(0)
+        sums = np.cumsum(prices, dtype=np.float64)
+        sums[window:] = sums[window:] - sums[:-window]
+        return sums[window - 1:] / window
+
+    def volatility(self, coin_id, window=None, since=None):
+        """Standard deviation of log returns over the last `window` samples."""
+        _, prices = self.prices(coin_id, since)
+        if window is not None:
+            prices = prices[-(window + 1):]
+        if len(prices) < 2:
+            return 0.0
+        return float(np.std(np.diff(np.log(prices))))
+
+    def min_max(self, coin_id, since=None):
+        _, prices = self.prices(coin_id, since)
+        if len(prices) == 0:
+            return None, None
+        return float(prices.min()), float(prices.max())
+
+    def correlation(self, coin_ids, since=None):
+        """Correlation matrix of returns, using samples taken at the same polls."""
+        timestamps, _ = self.prices(coin_ids[0], since)
+        for coin_id in coin_ids[1:]:
+            timestamps = np.intersect1d(timestamps, self.prices(coin_id, since)[0])
+
+        returns = []
+        for coin_id in coin_ids:
+            ts, prices = self.prices(coin_id, since)
+            aligned = prices[np.isin(ts, timestamps)]
+            returns.append(np.diff(np.log(aligned)))
+
+        if len(timestamps) < 3:
+            return np.full((len(coin_ids), len(coin_ids)), np.nan)
+        return np.corrcoef(np.vstack(returns))
+
+    def summary(self, coin_id, window=60):
+        low, high = self.min_max(coin_id)
+        means = self.rolling_mean(coin_id, window)
+        return {
+            "samples": self.series(coin_id).length,
+            "min": low,
+            "max": high,
+            "rolling_mean": float(means[-1]) if len(means) else None,
+            "volatility": self.volatility(coin_id, window),
+        }
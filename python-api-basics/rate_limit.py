@@ -0,0 +1,95 @@
+"""
+Client-side Rate Limiting
+=========================
+Paces requests per host with a token bucket so we stay under free-tier
+limits instead of bursting into 429 errors.
+
+Learn:
+- Token buckets: a burst allowance plus a sustained rate
+- Reserving a slot so waiting callers are served in order
+- The same limiter from threads (time.sleep) and asyncio (asyncio.sleep)
+"""
+
+import asyncio
+import threading
+import time
+
+# Requests per second and burst size for each host we call.
+# Hosts not listed here are not limited.
+HOST_LIMITS = {
+    "api.coinpaprika.com": {"rate": 10.0, "burst": 10},
+    "api.open-meteo.com": {"rate": 5.0, "burst": 10},
+}
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second, holding at most `burst` tokens."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a token now and return how long to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            # A negative balance is a queue of callers already waiting
+            return max(0.0, -self._tokens / self.rate)
+
+    def wait_time(self):
+        """Seconds until a request could go out, without reserving anything."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_limiters = {}
+_lock = threading.Lock()
+
+
+def get_limiter(host):
+    """Return the bucket for a host name, or None if the host isn't limited."""
+    limits = HOST_LIMITS.get(host)
+    if limits is None:
+        return None
+
+    with _lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = TokenBucket(limits["rate"], limits["burst"])
+            _limiters[host] = limiter
+    return limiter
+
+
+def set_limit(host, rate, burst):
+    """Add or change the limit for a host."""
+    HOST_LIMITS[host] = {"rate": rate, "burst": burst}
+    with _lock:
+        _limiters.pop(host, None)
+
+
+def wait_time(host):
+    """Seconds a new request to host would wait right now."""
+    limiter = get_limiter(host)
+    return limiter.wait_time() if limiter else 0.0
@@ -0,0 +1,130 @@
+"""
+Retry Policy
+============
+Decides whether a failed request is worth retrying, and how long to wait first.
+
+Learn:
+- Retryable vs non-retryable errors (a 404 won't fix itself)
+- Exponential backoff with full jitter
+- Honouring the server's Retry-After header
+- A retry budget so an outage can't multiply our request volume
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+
+def parse_retry_after(value):
+    """Return seconds to wait from a Retry-After header (seconds or HTTP date)."""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RetryBudget:
+    """Allow retries up to a fraction of recent requests.
+
+    Every request deposits `ratio` tokens and every retry spends one, so with
+    ratio=0.2 at most one extra request goes out per five normal ones.
+    """
+
+    def __init__(self, ratio=0.2, max_tokens=10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+
+class RetryPolicy:
+    """Which failures to retry and how long to back off between attempts."""
+
+    def __init__(
+        self,
+        base_delay=0.5,
+        max_delay=10.0,
+        retry_statuses=RETRY_STATUSES,
+        retry_exceptions=(ConnectionError, Timeout),
+        budget=None,
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.budget = budget
+
+    def is_retryable(self, error):
+        """True if the exception is a transient failure."""
+        if isinstance(error, HTTPError):
+            return error.response is not None and error.response.status_code in self.retry_statuses
+        return isinstance(error, self.retry_exceptions)
+
+    def record_request(self):
+        if self.budget is not None:
+            self.budget.record_request()
+
+    def should_retry(self, error):
+        """Check the error type and Retry-After, then spend from the retry budget.
+
+        A Retry-After longer than max_delay means giving up now: retrying
+        sooner than the server asked would only be refused again.
+        """
+        if not self.is_retryable(error):
+            return False
+        retry_after = self.retry_after(error)
+        if retry_after is not None and retry_after > self.max_delay:
+            return False
+        if self.budget is not None and not self.budget.try_spend():
+            return False
+        return True
+
+    def retry_after(self, error):
+        """Seconds the server asked us to wait (429 / 503 Retry-After), or None."""
+        response = getattr(error, "response", None)
+        if response is None or response.status_code not in RETRY_AFTER_STATUSES:
+            return None
+        return parse_retry_after(response.headers.get("Retry-After"))
+
+    def backoff(self, attempt, error=None):
+        """Seconds to wait before the next attempt (attempt starts at 1)."""
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            return retry_after
+
+        # Full jitter: anywhere between 0 and the exponential cap
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+# Shared by every safe_api_request call in the process
+default_policy = RetryPolicy(budget=RetryBudget())
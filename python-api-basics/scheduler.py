@@ -0,0 +1,143 @@
+"""
+Background Refresh Scheduler
+============================
+Refreshes data on a timer in the background and publishes it to a shared
+snapshot, so the dashboard can render instantly without waiting on the network.
+
+Learn:
+- Running jobs on intervals from one scheduler thread
+- Staggering start times (plus jitter) so requests don't all fire together
+- A lock-protected snapshot shared between threads
+"""
+
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Snapshot:
+    """Latest value for each key, with the time it was published."""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def publish(self, key, value):
+        with self._lock:
+            self._values[key] = (value, time.time())
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._values.get(key)
+        return default if entry is None else entry[0]
+
+    def age(self, key):
+        """Seconds since key was last published, or None."""
+        with self._lock:
+            entry = self._values.get(key)
+        return None if entry is None else time.time() - entry[1]
+
+    def keys(self):
+        with self._lock:
+            return list(self._values)
+
+
+class Job:
+    __slots__ = ("name", "fn", "args", "interval", "jitter", "running")
+
+    def __init__(self, name, fn, args, interval, jitter):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.interval = interval
+        self.jitter = jitter
+        self.running = False
+
+
+class RefreshScheduler:
+    """Runs each job every `interval` seconds on a small worker pool."""
+
+    def __init__(self, max_workers=4):
+        self.jobs = []
+        self._queue = []  # (next_run, order, job)
+        self._max_workers = max_workers
+        self._pool = None
+        self._wake = threading.Condition()
+        self._stopped = True
+        self._thread = None
+
+    def add_job(self, name, fn, interval, *args, jitter=0.1):
+        """Run fn(*args) every interval seconds, +/- jitter (a fraction of interval)."""
+        job = Job(name, fn, args, interval, jitter)
+        self.jobs.append(job)
+        return job
+
+    def _delay(self, job):
+        spread = job.interval * job.jitter
+        return job.interval + random.uniform(-spread, spread)
+
+    def start(self):
+        if not self._stopped:
+            return
+
+        # Jobs with the same interval start evenly spaced across it, and each
+        # interval group is shifted a fraction of a step so groups don't line up
+        now = time.monotonic()
+        by_interval = {}
+        for job in self.jobs:
+            by_interval.setdefault(job.interval, []).append(job)
+
+        self._queue = []
+        order = 0
+        for group, (interval, jobs) in enumerate(by_interval.items()):
+            step = interval / len(jobs)
+            offset = step * group / len(by_interval)
+            for i, job in enumerate(jobs):
+                heapq.heappush(self._queue, (now + offset + i * step, order, job))
+                order += 1
+
+        self._stopped = False
+        self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="refresh")
+        self._thread = threading.Thread(target=self._run, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._wake:
+            self._stopped = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _run(self):
+        with self._wake:
+            while not self._stopped:
+                if not self._queue:
+                    self._wake.wait()  # No jobs: sleep until stop()
+                    continue
+
+                next_run, order, job = self._queue[0]
+                wait = next_run - time.monotonic()
+                if wait > 0:
+                    self._wake.wait(wait)
+                    continue
+
+                heapq.heapreplace(self._queue, (time.monotonic() + self._delay(job), order, job))
+                # A slow job is skipped this round rather than piling up
+                if not job.running:
+                    job.running = True
+                    self._pool.submit(self._execute, job)
+
+    def _execute(self, job):
+        try:
+            job.fn(*job.args)
+        except Exception as e:
+            logging.warning(f"Refresh job '{job.name}' failed: {e}")
+        finally:
+            job.running = False
@@ -0,0 +1,120 @@
+"""
+Streaming JSON
+==============
+Read a big JSON list one item at a time instead of downloading and parsing
+the whole body first.
+
+Learn:
+- stream=True downloads the body in chunks as we read it
+- json.JSONDecoder.raw_decode parses one value from a buffer
+- Stopping early closes the connection, so the rest is never downloaded
+"""
+
+import codecs
+import json
+
+import api_client
+
+CHUNK_SIZE = 8192
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+_AFTER_ITEM = _WHITESPACE + ",]"  # What may follow an item inside an array
+
+
+def iter_json_array(chunks):
+    """Yield the items of a top-level JSON array from an iterable of byte chunks."""
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[pos:] + text.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
+
+    while True:
+        # Skip whitespace, the opening bracket and separators
+        while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (started and buffer[pos] == ",")):
+            pos += 1
+
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            read_more()
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+
+        # A number has no closing delimiter, so it may continue in the next chunk
+        # ("0." + "25"): only take it once a separator, "]" or whitespace follows
+        if isinstance(item, (int, float)) and not isinstance(item, bool):
+            if end == len(buffer) and not eof:
+                read_more()
+                continue
+            if end < len(buffer) and buffer[end] not in _AFTER_ITEM:
+                if eof:
+                    raise ValueError(f"Unexpected {buffer[end]!r} after a number in JSON array")
+                read_more()
+                continue
+
+        pos = end
+        yield item
+
+
+def stream_json_items(url, params=None, limit=None, chunk_size=CHUNK_SIZE, **kwargs):
+    """Yield items from a JSON list endpoint, stopping after `limit` items.
+
+    The response is closed as soon as the caller stops, even part way through.
+    """
+    response = api_client.get(url, params=params, stream=True, **kwargs)
+    try:
+        response.raise_for_status()
+        if limit == 0:
+            return
+
+        count = 0
+        for item in iter_json_array(response.iter_content(chunk_size)):
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
+    finally:
+        response.close()
+
+
+def _check_split_points(body=b'[0.25, -1.5e3, 12, "caf\xc3\xa9", true, null, {"a": [1, 2.5]}, 7]'):
+    """Parse body split in two at every byte offset; each split must give the same items."""
+    expected = json.loads(body)
+    for i in range(len(body) + 1):
+        items = list(iter_json_array([body[:i], body[i:]]))
+        assert items == expected, f"split at byte {i}: {items!r}"
+    print(f"iter_json_array: {len(body) + 1} split points OK")
+
+
+if __name__ == "__main__":
+    _check_split_points()